@@ -0,0 +1,153 @@
+# =======================================
+# ALERTAS DE PRECIOS MOVISTAR
+# Todos los cambios de una ejecución se envían como un resumen (o unos pocos
+# mensajes de hasta MAX_POR_MENSAJE cambios) por una sola conexión SMTP.
+# Un mismo SKU y precio no se vuelve a alertar dentro de VENTANA_DUPLICADOS
+# y cada SKU recibe como máximo una alerta por INTERVALO_MINIMO.
+# Los cambios salen de alertas_pendientes (precios_movistar.py) y se borran
+# de ahí sólo cuando su mensaje se envió: si el SMTP falla, o la ejecución
+# se corta antes de llegar a las alertas, se reintentan en la siguiente.
+# Credenciales y servidor por entorno (SMTP_HOST, SMTP_PORT, SMTP_SSL,
+# SMTP_USUARIO, SMTP_PASSWORD, ALERTA_DESTINO); con SMTP_HOST=localhost y
+# sin usuario sirve un servidor de prueba local (aiosmtpd, smtpd).
+# =======================================
+import os
+import smtplib
+from datetime import datetime, timedelta
+from email.mime.text import MIMEText
+
+import pandas as pd
+
+from precios_movistar import formatear_precio
+
+VENTANA_DUPLICADOS = timedelta(hours=24)
+INTERVALO_MINIMO = timedelta(hours=1)
+MAX_POR_MENSAJE = 50
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS alertas (
+    sku     TEXT NOT NULL,
+    precio  INTEGER NOT NULL,
+    enviada TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS alertas_sku ON alertas (sku, enviada);
+"""
+
+# =======================================
+# CONFIGURACIÓN SMTP
+# =======================================
+def config_smtp(entorno=os.environ):
+    usuario = entorno.get("SMTP_USUARIO")
+    destino = entorno.get("ALERTA_DESTINO", usuario)
+    return {
+        "host": entorno.get("SMTP_HOST", "smtp.gmail.com"),
+        "puerto": int(entorno.get("SMTP_PORT", "465")),
+        "ssl": entorno.get("SMTP_SSL", "1") == "1",
+        "usuario": usuario,
+        "password": entorno.get("SMTP_PASSWORD"),
+        "remitente": entorno.get("ALERTA_REMITENTE", usuario or destino),
+        "destino": destino,
+    }
+
+def abrir_smtp(config):
+    clase = smtplib.SMTP_SSL if config["ssl"] else smtplib.SMTP
+    servidor = clase(config["host"], config["puerto"], timeout=30)
+    if config["usuario"]:
+        servidor.login(config["usuario"], config["password"])
+    return servidor
+
+# =======================================
+# PENDIENTES, DEDUPLICACIÓN Y LÍMITE POR SKU
+# =======================================
+def leer_pendientes(conn):
+    filas = conn.execute(
+        "SELECT sku, producto, precio_anterior, precio_nuevo, diferencia "
+        "FROM alertas_pendientes ORDER BY rowid"
+    ).fetchall()
+    return pd.DataFrame(filas, columns=["sku", "producto", "precio_anterior",
+                                        "precio_nuevo", "diferencia"])
+
+def filtrar_repetidas(conn, cambios, ahora):
+    # Devuelve (cambios a enviar, SKUs ya alertados con ese precio). Los SKU
+    # alertados hace menos de INTERVALO_MINIMO siguen pendientes
+    conn.executescript(ESQUEMA)
+    desde_dup = (ahora - VENTANA_DUPLICADOS).strftime("%Y-%m-%d %H:%M:%S")
+    desde_min = (ahora - INTERVALO_MINIMO).strftime("%Y-%m-%d %H:%M:%S")
+    recientes = conn.execute(
+        "SELECT sku, precio, enviada FROM alertas WHERE enviada >= ?", (desde_dup,)
+    ).fetchall()
+    duplicadas = {(sku, precio) for sku, precio, _ in recientes}
+    limitadas = {sku for sku, _, enviada in recientes if enviada >= desde_min}
+    claves = list(zip(cambios["sku"], cambios["precio_nuevo"].astype(int)))
+    repetida = [clave in duplicadas for clave in claves]
+    enviar = [not rep and sku not in limitadas for rep, (sku, _) in zip(repetida, claves)]
+    return cambios[enviar].reset_index(drop=True), cambios["sku"][repetida].tolist()
+
+def quitar_pendientes(conn, skus):
+    with conn:
+        conn.executemany("DELETE FROM alertas_pendientes WHERE sku = ?", [(sku,) for sku in skus])
+
+def registrar_enviadas(conn, cambios, ahora):
+    # En la misma transacción: se anotan como enviadas y dejan de estar pendientes
+    with conn:
+        conn.executemany(
+            "INSERT INTO alertas (sku, precio, enviada) VALUES (?, ?, ?)",
+            [(sku, int(precio), ahora.strftime("%Y-%m-%d %H:%M:%S"))
+             for sku, precio in zip(cambios["sku"], cambios["precio_nuevo"])],
+        )
+        conn.executemany("DELETE FROM alertas_pendientes WHERE sku = ?",
+                         [(sku,) for sku in cambios["sku"]])
+
+# =======================================
+# RESUMEN
+# =======================================
+def armar_resumenes(cambios, config, max_por_mensaje=MAX_POR_MENSAJE):
+    mensajes = []
+    for inicio in range(0, len(cambios), max_por_mensaje):
+        bloque = cambios.iloc[inicio:inicio + max_por_mensaje]
+        lineas = [
+            f"{producto} (SKU {sku}): {formatear_precio(anterior)} → "
+            f"{formatear_precio(nuevo)} ({diferencia*100:.1f}%)"
+            for sku, producto, anterior, nuevo, diferencia in bloque.itertuples(index=False)
+        ]
+        mensaje = MIMEText("\n".join(lineas), "plain", "utf-8")
+        if len(cambios) == 1:
+            mensaje["Subject"] = f"🚨 Cambio ≥50%: {bloque['producto'].iloc[0]}"
+        else:
+            parte = (f" ({inicio // max_por_mensaje + 1}/"
+                     f"{-(-len(cambios) // max_por_mensaje)})" if len(cambios) > max_por_mensaje else "")
+            mensaje["Subject"] = f"🚨 {len(cambios)} cambios de precio ≥50%{parte}"
+        mensaje["From"] = config["remitente"]
+        mensaje["To"] = config["destino"]
+        mensajes.append(mensaje)
+    return mensajes
+
+def enviar_alertas(conn, config=None, ahora=None):
+    # Envía las alertas pendientes; devuelve la cantidad de cambios alertados
+    config = config or config_smtp()
+    ahora = ahora or datetime.now()
+    pendientes = leer_pendientes(conn)
+    if pendientes.empty:
+        return 0
+    cambios, repetidas = filtrar_repetidas(conn, pendientes, ahora)
+    if repetidas:
+        quitar_pendientes(conn, repetidas)
+    if cambios.empty:
+        return 0
+    if not config["destino"]:
+        print("⚠️ Sin ALERTA_DESTINO ni SMTP_USUARIO: las alertas quedan pendientes")
+        return 0
+
+    mensajes = armar_resumenes(cambios, config)
+    servidor = abrir_smtp(config)
+    try:
+        # Cada mensaje se confirma al enviarse: si falla uno, los anteriores
+        # no se repiten en el próximo intento
+        for i, mensaje in enumerate(mensajes):
+            servidor.sendmail(config["remitente"], [config["destino"]], mensaje.as_string())
+            bloque = cambios.iloc[i * MAX_POR_MENSAJE:(i + 1) * MAX_POR_MENSAJE]
+            registrar_enviadas(conn, bloque, ahora)
+    finally:
+        servidor.quit()
+    print(f"📧 {len(cambios)} alerta(s) enviadas en {len(mensajes)} mensaje(s)")
+    return len(cambios)
@@ -0,0 +1,207 @@
+# =======================================
+# BACKTEST WALK-FORWARD
+# Evalúa el ensamble sobre el histórico con ventanas crecientes o móviles.
+# Cada fold parte de los pesos del fold anterior y sólo se ajusta con los
+# sorteos nuevos; las predicciones y métricas de cada fold quedan en disco
+# y una nueva ejecución sólo calcula los folds que faltan.
+#   python backtest.py --paso 100 --modo expanding
+# =======================================
+import argparse
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from preprocesamiento import ventanas
+
+DIR_CACHE = "backtest_cache"
+MODELOS = ("lstm", "transformer", "ensamble")
+
+# =======================================
+# FOLDS
+# =======================================
+def generar_folds(n, inicio, paso, modo="expanding", ventana=None):
+    # Índices sobre las ventanas: (ini_entrenamiento, corte, fin_test)
+    folds = []
+    corte = inicio
+    while corte < n:
+        fin = min(corte + paso, n)
+        ini = 0 if modo == "expanding" else max(0, corte - (ventana or inicio))
+        folds.append((ini, corte, fin))
+        corte = fin
+    return folds
+
+# =======================================
+# MÉTRICAS
+# =======================================
+def puntuar(probs, y, ks=(1, 3), bins=10):
+    probs = np.asarray(probs, dtype=np.float64)
+    y = np.asarray(y, dtype=np.int64)
+    p_real = np.clip(probs[np.arange(len(y)), y], 1e-12, 1.0)
+    resultado = {"n": int(len(y)), "log_loss": float(-np.mean(np.log(p_real)))}
+
+    orden = np.argsort(-probs, axis=1)
+    for k in ks:
+        resultado[f"top{k}"] = float(np.mean((orden[:, :k] == y[:, np.newaxis]).any(axis=1)))
+
+    # Error de calibración esperado sobre la confianza de la clase predicha
+    confianza = probs.max(axis=1)
+    acierto = orden[:, 0] == y
+    grupo = np.minimum((confianza * bins).astype(int), bins - 1)
+    conteo = np.bincount(grupo, minlength=bins)
+    suma_conf = np.bincount(grupo, weights=confianza, minlength=bins)
+    suma_acierto = np.bincount(grupo, weights=acierto, minlength=bins)
+    resultado["ece"] = float(np.abs(suma_acierto - suma_conf).sum() / max(len(y), 1))
+    resultado["bins_usados"] = int((conteo > 0).sum())
+    return resultado
+
+def metricas_por_modelo(probs, y, num_classes=10):
+    # probs: (n, 2, num_classes) con lstm y transformer
+    filas = {}
+    for i, nombre in enumerate(MODELOS[:2]):
+        filas[nombre] = puntuar(probs[:, i], y)
+    filas["ensamble"] = puntuar(probs.mean(axis=1), y)
+    filas["uniforme"] = puntuar(np.full((len(y), num_classes), 1.0 / num_classes), y)
+    return filas
+
+# =======================================
+# CACHÉ EN DISCO
+# =======================================
+def clave_config(config):
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()[:12]
+
+def huella_datos(numeros, hasta):
+    return hashlib.sha1(np.ascontiguousarray(numeros[:hasta]).tobytes()).hexdigest()
+
+def _ruta_fold(directorio, i):
+    return os.path.join(directorio, f"fold_{i:04d}.npz")
+
+def _leer_fold(directorio, i, huella):
+    ruta = _ruta_fold(directorio, i)
+    if not os.path.exists(ruta):
+        return None
+    datos = np.load(ruta)
+    if str(datos["huella"]) != huella:
+        return False
+    return datos["probs"], datos["y"]
+
+# =======================================
+# EJECUCIÓN
+# =======================================
+def ejecutar_backtest(numeros, seq_length=10, inicio=2000, paso=100, modo="expanding",
+                      ventana=None, epocas_iniciales=10, epocas_ajuste=2, batch_size=32,
+                      dir_cache=DIR_CACHE, semilla=0):
+    numeros = np.asarray(numeros, dtype=np.uint8)
+    X, y = ventanas(numeros, seq_length)
+    folds = generar_folds(len(y), inicio, paso, modo, ventana)
+
+    config = {
+        "seq_length": seq_length, "inicio": inicio, "paso": paso, "modo": modo,
+        "ventana": ventana, "epocas_iniciales": epocas_iniciales,
+        "epocas_ajuste": epocas_ajuste, "batch_size": batch_size, "semilla": semilla,
+    }
+    directorio = os.path.join(dir_cache, clave_config(config))
+    os.makedirs(directorio, exist_ok=True)
+    with open(os.path.join(directorio, "config.json"), "w") as f:
+        json.dump(config, f, indent=2)
+    rutas_pesos = (os.path.join(directorio, "ultimo_lstm.h5"),
+                   os.path.join(directorio, "ultimo_trans.h5"))
+
+    modelos = None
+    predictor = None
+    corte_previo = None
+    filas, todas_probs, todas_y = [], [], []
+
+    for i, (ini, corte, fin) in enumerate(folds):
+        # Un fold sólo depende de los sorteos hasta su último objetivo
+        huella = huella_datos(numeros, fin + seq_length)
+        cacheado = _leer_fold(directorio, i, huella) if modelos is None else None
+
+        if cacheado is False:
+            # El histórico cambió: los folds guardados ya no son válidos
+            print(f"♻️ Histórico distinto en el fold {i}, se recalcula desde cero")
+            shutil.rmtree(directorio)
+            return ejecutar_backtest(numeros, seq_length, inicio, paso, modo, ventana,
+                                     epocas_iniciales, epocas_ajuste, batch_size,
+                                     dir_cache, semilla)
+
+        if cacheado is not None:
+            probs, y_test = cacheado
+        else:
+            if modelos is None:
+                import tensorflow as tf
+                from modelos import crear_modelo_lstm, crear_modelo_transformer, crear_predictor_ensamble
+
+                tf.keras.utils.set_random_seed(semilla)
+                modelos = (crear_modelo_lstm(seq_length), crear_modelo_transformer(seq_length))
+                predictor = crear_predictor_ensamble(*modelos, seq_length)
+                if i > 0:
+                    # Se retoma desde los pesos del último fold guardado
+                    for modelo, ruta in zip(modelos, rutas_pesos):
+                        modelo.load_weights(ruta)
+                    corte_previo = folds[i - 1][1]
+
+            if corte_previo is None:
+                desde, epocas = ini, epocas_iniciales
+            else:
+                desde, epocas = max(ini, corte_previo), epocas_ajuste
+            print(f"🧪 Fold {i + 1}/{len(folds)}: ajuste con {corte - desde} ventanas "
+                  f"({epocas} épocas), test {fin - corte}")
+
+            y_fold = np.asarray(y[desde:corte], dtype=np.int32)
+            for modelo in modelos:
+                modelo.fit(X[desde:corte], y_fold, epochs=epocas,
+                           batch_size=batch_size, verbose=0)
+
+            # Todos los puntos de test del fold en una sola pasada
+            p_lstm, p_trans = predictor(X[corte:fin])
+            probs = np.stack([p_lstm, p_trans], axis=1)
+            y_test = np.asarray(y[corte:fin])
+
+            # El último fold incompleto crecerá con nuevos sorteos: no se guarda
+            if fin - corte == paso:
+                np.savez(_ruta_fold(directorio, i), probs=probs, y=y_test, huella=huella)
+                for modelo, ruta in zip(modelos, rutas_pesos):
+                    modelo.save_weights(ruta)
+
+        corte_previo = corte
+        todas_probs.append(probs)
+        todas_y.append(y_test)
+        for nombre, valores in metricas_por_modelo(probs, y_test).items():
+            filas.append({"fold": i, "corte": corte, "modelo": nombre, **valores})
+
+    por_fold = pd.DataFrame(filas)
+    if not todas_y:
+        return por_fold, pd.DataFrame()
+    globales = metricas_por_modelo(np.concatenate(todas_probs), np.concatenate(todas_y))
+    resumen = pd.DataFrame.from_dict(globales, orient="index")
+    return por_fold, resumen
+
+# =======================================
+# MAIN
+# =======================================
+if __name__ == "__main__":
+    from historial import actualizar_historial
+    from preprocesamiento import serie_numeros
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seq-length", type=int, default=10)
+    parser.add_argument("--inicio", type=int, default=2000,
+                        help="Ventanas de entrenamiento del primer fold")
+    parser.add_argument("--paso", type=int, default=100, help="Ventanas de test por fold")
+    parser.add_argument("--modo", choices=["expanding", "rolling"], default="expanding")
+    parser.add_argument("--ventana", type=int, default=None,
+                        help="Tamaño de la ventana móvil (modo rolling)")
+    parser.add_argument("--epocas-iniciales", type=int, default=10)
+    parser.add_argument("--epocas-ajuste", type=int, default=2)
+    args = parser.parse_args()
+
+    resultados = actualizar_historial(num_anios=10)
+    por_fold, resumen = ejecutar_backtest(
+        serie_numeros(resultados), args.seq_length, args.inicio, args.paso, args.modo,
+        args.ventana, args.epocas_iniciales, args.epocas_ajuste,
+    )
+    print(resumen.to_string())
@@ -0,0 +1,211 @@
+# =======================================
+# BARRIDO DE HIPERPARÁMETROS (TRANSFORMER)
+# Evalúa una rejilla (o muestra aleatoria) de embed_dim, heads, ff_dim,
+# dropout y seq_length en un pool de procesos. La serie de números se
+# comparte por memoria compartida y cada proceso arma sus ventanas sin
+# copiarla. Las configuraciones malas se descartan por successive halving
+# y cada prueba terminada queda en disco: repetir el barrido sólo calcula
+# lo que falta. Cada escalón guarda el modelo completo (.keras, con el
+# estado de Adam), así que el siguiente sigue entrenando sin reiniciar el
+# optimizador.
+#   python barrido.py --aleatorio 12 --epocas-min 2 --eta 3
+# =======================================
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+import pandas as pd
+
+DIR_CACHE = "barrido_cache"
+ESPACIO = {
+    "embed_dim": [16, 32, 64],
+    "heads": [1, 2, 4],
+    "ff_dim": [32, 64, 128],
+    "dropout": [0.0, 0.1, 0.2],
+    "seq_length": [5, 10, 20],
+}
+
+# =======================================
+# CONFIGURACIONES
+# =======================================
+def rejilla(espacio=ESPACIO):
+    nombres = sorted(espacio)
+    return [dict(zip(nombres, valores))
+            for valores in itertools.product(*(espacio[n] for n in nombres))]
+
+def muestra_aleatoria(espacio=ESPACIO, n=10, semilla=0):
+    configs = rejilla(espacio)
+    rng = np.random.default_rng(semilla)
+    elegidos = rng.choice(len(configs), size=min(n, len(configs)), replace=False)
+    return [configs[i] for i in sorted(elegidos)]
+
+def clave_prueba(config, huella, validacion, batch_size, semilla):
+    # Dirección por contenido: misma config + mismos datos = misma prueba
+    contenido = {"config": config, "datos": huella, "validacion": validacion,
+                 "batch_size": batch_size, "semilla": semilla}
+    return hashlib.sha1(json.dumps(contenido, sort_keys=True).encode()).hexdigest()[:16]
+
+def _ruta_resultado(dir_cache, clave, epocas):
+    return os.path.join(dir_cache, f"{clave}_e{epocas}.json")
+
+def _ruta_modelo(dir_cache, clave, epocas):
+    return os.path.join(dir_cache, "modelos", f"{clave}_e{epocas}.keras")
+
+# =======================================
+# WORKER
+# =======================================
+_serie = None
+_shm = None
+
+def _iniciar_worker(nombre_shm, n, hilos):
+    global _serie, _shm
+    import tensorflow as tf
+
+    # Varios procesos en paralelo: cada uno con pocos hilos para no competir
+    tf.config.threading.set_intra_op_parallelism_threads(hilos)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    _shm = shared_memory.SharedMemory(name=nombre_shm)
+    _serie = np.ndarray((n,), dtype=np.uint8, buffer=_shm.buf)
+
+def evaluar_prueba(tarea):
+    import tensorflow as tf
+    from modelos import crear_modelo_transformer
+    from preprocesamiento import ventanas, dataset_entrenamiento
+
+    config, clave, epocas, epocas_previas = (
+        tarea["config"], tarea["clave"], tarea["epocas"], tarea["epocas_previas"])
+    dir_cache = tarea["dir_cache"]
+
+    tf.keras.utils.set_random_seed(tarea["semilla"])
+    seq_length = config["seq_length"]
+    X, y = ventanas(_serie, seq_length)
+    corte = len(y) - int(len(y) * tarea["validacion"])
+
+    # Se retoma desde el modelo del escalón anterior (pesos y optimizador) si existe
+    previo = _ruta_modelo(dir_cache, clave, epocas_previas) if epocas_previas else None
+    if previo and os.path.exists(previo):
+        modelo = tf.keras.models.load_model(previo)
+        desde = epocas_previas
+    else:
+        modelo = crear_modelo_transformer(
+            seq_length, embed_dim=config["embed_dim"], heads=config["heads"],
+            ff_dim=config["ff_dim"], dropout=config["dropout"],
+        )
+        desde = 0
+
+    datos = dataset_entrenamiento(X[:corte], y[:corte], tarea["batch_size"],
+                                  seed=tarea["semilla"])
+    datos_val = dataset_entrenamiento(X[corte:], y[corte:], tarea["batch_size"], shuffle=False)
+    modelo.fit(datos, epochs=epocas, initial_epoch=desde, verbose=0)
+    val_loss = float(modelo.evaluate(datos_val, verbose=0))
+
+    modelo.save(_ruta_modelo(dir_cache, clave, epocas))
+    resultado = {"clave": clave, **config, "epocas": epocas, "val_loss": val_loss}
+    with open(_ruta_resultado(dir_cache, clave, epocas), "w") as f:
+        json.dump(resultado, f, indent=2)
+    return resultado
+
+# =======================================
+# SUCCESSIVE HALVING
+# =======================================
+def escalones(epocas_min, epocas_max, eta):
+    epocas, lista = epocas_min, []
+    while epocas < epocas_max:
+        lista.append(epocas)
+        epocas *= eta
+    lista.append(epocas_max)
+    return lista
+
+def ejecutar_barrido(numeros, configs, epocas_min=2, epocas_max=18, eta=3,
+                     validacion=0.1, batch_size=32, max_workers=None,
+                     dir_cache=DIR_CACHE, semilla=0):
+    if eta < 2:
+        raise ValueError(f"eta debe ser >= 2 (recibido {eta})")
+    if epocas_min < 1 or epocas_max < epocas_min:
+        raise ValueError(f"Se requiere 1 <= epocas_min <= epocas_max "
+                         f"(recibido {epocas_min} y {epocas_max})")
+    numeros = np.ascontiguousarray(numeros, dtype=np.uint8)
+    huella = hashlib.sha1(numeros.tobytes()).hexdigest()
+    os.makedirs(os.path.join(dir_cache, "modelos"), exist_ok=True)
+    max_workers = max_workers or os.cpu_count() or 1
+    hilos = max(1, (os.cpu_count() or 1) // max_workers)
+
+    vivas = [(config, clave_prueba(config, huella, validacion, batch_size, semilla))
+             for config in configs]
+    filas = []
+
+    shm = shared_memory.SharedMemory(create=True, size=max(numeros.nbytes, 1))
+    try:
+        np.ndarray(numeros.shape, dtype=np.uint8, buffer=shm.buf)[:] = numeros
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=get_context("spawn"),
+                                 initializer=_iniciar_worker,
+                                 initargs=(shm.name, len(numeros), hilos)) as pool:
+            epocas_previas = 0
+            for r, epocas in enumerate(escalones(epocas_min, epocas_max, eta)):
+                resultados, pendientes = {}, []
+                for config, clave in vivas:
+                    ruta = _ruta_resultado(dir_cache, clave, epocas)
+                    if os.path.exists(ruta):
+                        with open(ruta) as f:
+                            resultados[clave] = json.load(f)
+                    else:
+                        pendientes.append({
+                            "config": config, "clave": clave, "epocas": epocas,
+                            "epocas_previas": epocas_previas, "validacion": validacion,
+                            "batch_size": batch_size, "semilla": semilla,
+                            "dir_cache": dir_cache,
+                        })
+                print(f"🪜 Escalón {r + 1}: {len(vivas)} configs a {epocas} épocas "
+                      f"({len(resultados)} en caché, {len(pendientes)} por entrenar)")
+                for resultado in pool.map(evaluar_prueba, pendientes):
+                    resultados[resultado["clave"]] = resultado
+
+                for config, clave in vivas:
+                    filas.append({"escalon": r + 1, **resultados[clave]})
+
+                # Sólo la mejor fracción 1/eta pasa al siguiente escalón
+                vivas.sort(key=lambda cc: resultados[cc[1]]["val_loss"])
+                vivas = vivas[:max(1, math.ceil(len(vivas) / eta))]
+                epocas_previas = epocas
+    finally:
+        shm.close()
+        shm.unlink()
+
+    tabla = pd.DataFrame(filas)
+    return tabla.sort_values(["escalon", "val_loss"], ascending=[False, True],
+                             ignore_index=True)
+
+# =======================================
+# MAIN
+# =======================================
+if __name__ == "__main__":
+    from historial import actualizar_historial
+    from preprocesamiento import serie_numeros
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--aleatorio", type=int, default=0,
+                        help="Configs al azar de la rejilla (0 = rejilla completa)")
+    parser.add_argument("--epocas-min", type=int, default=2)
+    parser.add_argument("--epocas-max", type=int, default=18)
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("--procesos", type=int, default=0,
+                        help="Procesos en paralelo (0 = núcleos disponibles)")
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    resultados = actualizar_historial(num_anios=10)
+    configs = (muestra_aleatoria(n=args.aleatorio, semilla=args.semilla)
+               if args.aleatorio else rejilla())
+    tabla = ejecutar_barrido(
+        serie_numeros(resultados), configs, args.epocas_min, args.epocas_max, args.eta,
+        max_workers=args.procesos or None, semilla=args.semilla,
+    )
+    print(tabla.to_string(index=False))
+    mejor = tabla.iloc[0]
+    print(f"🏆 Mejor config: {mejor[list(ESPACIO)].to_dict()} (val_loss {mejor['val_loss']:.4f})")
@@ -0,0 +1,135 @@
+# =======================================
+# BENCHMARK DE INFERENCIA (KERAS / NUMPY / TFLITE FLOAT32 / FLOAT16 / INT8)
+# Exporta el ensamble en cada modo de cuantización, comprueba que las
+# distribuciones coinciden con las de Keras float32 y mide latencia y
+# memoria por predicción (una ventana por llamada, como en main.py).
+#   python benchmarks/bench_inferencia.py [--consultas 200] [--estricto]
+# =======================================
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from metricas import rss_mb
+from predictor_numpy import PredictorNumPy
+from predictor_tflite import MODOS, PredictorTFLite
+
+# Diferencia absoluta máxima admitida frente a Keras float32
+TOLERANCIAS = {"float32": 1e-5, "float16": 1e-2, "int8": 5e-2, "numpy": 1e-5}
+
+def cargar_o_crear_modelos(seq_length):
+    from modelos import (
+        crear_modelo_lstm, crear_modelo_transformer, RUTA_PESOS_LSTM, RUTA_PESOS_TRANS
+    )
+    modelos = (crear_modelo_lstm(seq_length), crear_modelo_transformer(seq_length))
+    if os.path.exists(RUTA_PESOS_LSTM) and os.path.exists(RUTA_PESOS_TRANS):
+        modelos[0].load_weights(RUTA_PESOS_LSTM)
+        modelos[1].load_weights(RUTA_PESOS_TRANS)
+        print("📥 Pesos entrenados cargados")
+    else:
+        print("⚠️ Sin pesos entrenados: se comparan modelos con pesos aleatorios")
+    return modelos
+
+def paridad(referencia, probs, tolerancia):
+    diferencia = np.abs(np.concatenate(probs, axis=1) - np.concatenate(referencia, axis=1))
+    coincide = np.mean(
+        np.argmax(probs[0] + probs[1], axis=1) == np.argmax(referencia[0] + referencia[1], axis=1)
+    )
+    return {
+        "dif_max": float(diferencia.max()),
+        "dif_media": float(diferencia.mean()),
+        "misma_clase": float(coincide),
+        "ok": bool(diferencia.max() <= tolerancia),
+    }
+
+def medir_latencia(predictor, entradas, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        for fila in entradas:
+            inicio = time.perf_counter()
+            predictor(fila[np.newaxis, :])
+            tiempos.append(time.perf_counter() - inicio)
+    tiempos = np.array(tiempos) * 1000
+    return float(np.median(tiempos)), float(np.percentile(tiempos, 95))
+
+def memoria_por_prediccion(predictor, fila):
+    tracemalloc.start()
+    predictor(fila[np.newaxis, :])
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico / 1024
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--consultas", type=int, default=200)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--seq-length", type=int, default=10)
+    parser.add_argument("--estricto", action="store_true",
+                        help="Termina con código 1 si algún modo supera su tolerancia")
+    args = parser.parse_args()
+
+    from exportar import exportar_tflite
+    from modelos import crear_predictor_ensamble
+
+    rng = np.random.default_rng(0)
+    entradas = rng.integers(0, 10, size=(args.consultas, args.seq_length), dtype=np.int32)
+
+    modelo_lstm, modelo_trans = cargar_o_crear_modelos(args.seq_length)
+    predictor_keras = crear_predictor_ensamble(modelo_lstm, modelo_trans, args.seq_length)
+    referencia = predictor_keras(entradas)
+
+    filas = []
+    mediana, p95 = medir_latencia(predictor_keras, entradas, args.repeticiones)
+    filas.append({"modo": "keras", "kb": None, "rss_carga_mb": None, "ms_mediana": mediana,
+                  "ms_p95": p95, "kb_por_pred": memoria_por_prediccion(predictor_keras, entradas[0]),
+                  **paridad(referencia, referencia, 0)})
+
+    with tempfile.TemporaryDirectory() as directorio:
+        # Pasada NumPy sobre los mismos pesos guardados en .h5
+        rutas_h5 = (os.path.join(directorio, "lstm.h5"), os.path.join(directorio, "trans.h5"))
+        modelo_lstm.save_weights(rutas_h5[0])
+        modelo_trans.save_weights(rutas_h5[1])
+        antes = rss_mb()
+        predictor = PredictorNumPy(*rutas_h5).predecir
+        rss_carga = rss_mb() - antes
+        mediana, p95 = medir_latencia(predictor, entradas, args.repeticiones)
+        filas.append({
+            "modo": "numpy", "kb": sum(os.path.getsize(r) for r in rutas_h5) / 1024,
+            "rss_carga_mb": rss_carga, "ms_mediana": mediana, "ms_p95": p95,
+            "kb_por_pred": memoria_por_prediccion(predictor, entradas[0]),
+            **paridad(referencia, predictor(entradas), TOLERANCIAS["numpy"]),
+        })
+
+        rutas = exportar_tflite(modelo_lstm, modelo_trans, args.seq_length,
+                                ruta=os.path.join(directorio, "modelo_ensamble.tflite"),
+                                modos=MODOS)
+        for modo in MODOS:
+            antes = rss_mb()
+            predictor = PredictorTFLite(rutas[modo]).predecir
+            predictor(entradas[:1])
+            rss_carga = rss_mb() - antes
+
+            mediana, p95 = medir_latencia(predictor, entradas, args.repeticiones)
+            filas.append({
+                "modo": f"tflite-{modo}", "kb": os.path.getsize(rutas[modo]) / 1024,
+                "rss_carga_mb": rss_carga, "ms_mediana": mediana, "ms_p95": p95,
+                "kb_por_pred": memoria_por_prediccion(predictor, entradas[0]),
+                **paridad(referencia, predictor(entradas), TOLERANCIAS[modo]),
+            })
+
+    import pandas as pd
+    tabla = pd.DataFrame(filas)
+    print(tabla.to_string(index=False, float_format=lambda v: f"{v:.4g}"))
+
+    fallidos = tabla.loc[~tabla["ok"], "modo"].tolist()
+    if fallidos:
+        print(f"❌ Fuera de tolerancia: {', '.join(fallidos)}")
+        if args.estricto:
+            sys.exit(1)
+    else:
+        print("✅ Todas las variantes dentro de tolerancia")
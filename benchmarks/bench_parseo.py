@@ -0,0 +1,86 @@
+# =======================================
+# BENCHMARK DE PARSEO LOTERIAS.COM
+# Compara el recorrido original (BeautifulSoup + html.parser sobre la
+# página completa, un dict por fila) con los backends de parseo.py.
+#   python benchmarks/bench_parseo.py [--repeticiones 5]
+# =======================================
+import argparse
+import glob
+import os
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from parseo import MESES, backends_disponibles, parsear_sorteos, sorteos_a_dataframe
+
+DIR_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+def corregir_fecha(fecha_str):
+    for mes_abrev, mes_num in MESES.items():
+        if mes_abrev in fecha_str:
+            fecha_str = fecha_str.replace(mes_abrev, mes_num)
+            return datetime.strptime(fecha_str, "%d %m %Y")
+    raise ValueError(f"Mes no reconocido en fecha '{fecha_str}'")
+
+def parseo_referencia(html):
+    # Copia del recorrido anterior de extraer_resultados_por_anio
+    soup = BeautifulSoup(html, "html.parser")
+    tabla = soup.find("table", class_="archives")
+    datos = []
+    for fila in tabla.tbody.find_all("tr"):
+        celdas = fila.find_all("td")
+        if len(celdas) < 2:
+            continue
+        enlace = celdas[0].find("a")
+        if not enlace:
+            continue
+        partes = enlace.get_text(separator=" ").strip().split()
+        if len(partes) < 3:
+            continue
+        try:
+            fecha = corregir_fecha(" ".join(partes[1:]))
+        except ValueError:
+            continue
+        for lista in celdas[1].find_all("ul", class_="balls"):
+            tipo = lista.find("li").text.strip()
+            numeros = [li.text.strip() for li in lista.find_all("li", class_="ball")]
+            if len(numeros) != 3:
+                continue
+            datos.append({"Fecha": fecha, "Turno": tipo, "Último Número": int(numeros[2])})
+    return pd.DataFrame(datos)
+
+def medir(funcion, paginas, repeticiones):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for html in paginas:
+            funcion(html)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor / len(paginas)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    rutas = sorted(glob.glob(os.path.join(DIR_FIXTURES, "loto3_*.html")))
+    paginas = [open(r, encoding="utf-8").read() for r in rutas]
+    print(f"📄 {len(paginas)} páginas de fixture")
+
+    # Todos los backends deben producir el mismo resultado que la referencia
+    referencia = parseo_referencia(paginas[0])
+    for backend in backends_disponibles():
+        df = sorteos_a_dataframe(parsear_sorteos(paginas[0], backend))
+        assert len(df) == len(referencia), backend
+        assert (df["Último Número"].values == referencia["Último Número"].values).all(), backend
+        assert (df["Fecha"].values == referencia["Fecha"].values).all(), backend
+
+    t_ref = medir(parseo_referencia, paginas, args.repeticiones)
+    print(f"{'referencia (bs4 completo)':<28} {t_ref * 1000:8.1f} ms/página")
+    for backend in backends_disponibles():
+        t = medir(lambda html: parsear_sorteos(html, backend), paginas, args.repeticiones)
+        print(f"{backend:<28} {t * 1000:8.1f} ms/página   x{t_ref / t:5.1f}")
@@ -0,0 +1,382 @@
+# =======================================
+# SUITE DE BENCHMARKS SIN RED
+# Mide las rutas principales sin red, a varios tamaños, y compara contra
+# una línea base JSON. Los datos salen de generar_fixtures.py (réplicas
+# sintéticas, no páginas descargadas) y de hojas falsas en memoria:
+#   fixtures/loto3_2023.html y loto3_2024.html  páginas de loterias.com
+#       (table.archives); los años que falten se generan al vuelo
+#   tarjetas_movistar()  catálogos con las columnas de scrape_movistar,
+#       en memoria (no hay fixture HTML de Movistar)
+# Casos: parseo_anios, preparar_datos_lstm, monte_carlo, monte_carlo_muestras,
+# prediccion_numpy, tf_construir_modelos, tf_load_weights, tf_prediccion,
+# sheets_append, sheets_append_libro, movistar_historico y movistar_espejo.
+#   python benchmarks/bench_suite.py                    (sólo medir)
+#   python benchmarks/bench_suite.py --guardar          (actualiza baseline.json)
+#   python benchmarks/bench_suite.py --comparar         (código 1 si algo empeoró)
+#   python benchmarks/bench_suite.py --solo sheets --comparar
+# Los casos de TensorFlow (o h5py) se omiten si no están instalados.
+# Cada caso se mide en varias rondas y se compara la mediana, descontando
+# la deriva general de la máquina: se admite un 15% (20% en los casos de
+# TensorFlow y BLAS, con más varianza).
+# La línea base conviene grabarla con más rondas (--guardar --rondas 9).
+# =======================================
+import argparse
+import contextlib
+import gc
+import glob
+import importlib.util
+import io
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ensamble import simulacion_monte_carlo
+from espejo_sheets import EspejoHoja
+from generar_fixtures import DIR_FIXTURES, pagina_loto3, tarjetas_movistar
+from hoja_falsa import HojaFalsa, LibroFalso
+from precios_movistar import abrir_precios, registrar_scraping
+from preprocesamiento import preparar_datos_lstm
+from resultados import extraer_resultados_por_anio
+from sumidero_sheets import SumideroSheets
+
+RUTA_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SEQ_LENGTH = 10
+CASOS = []
+TOLERANCIAS = {}
+
+def caso(nombre, tamanos, requiere=(), tolerancia=None):
+    # Registra preparar(tamano) -> callable medido; se omite si falta algún módulo de `requiere`.
+    # tolerancia: mínimo propio del caso para --tolerancia (casos con más varianza)
+    def decorador(preparar):
+        CASOS.append((nombre, tamanos, requiere, preparar))
+        if tolerancia is not None:
+            TOLERANCIAS[nombre] = tolerancia
+        return preparar
+    return decorador
+
+# =======================================
+# FIXTURES EN MEMORIA
+# =======================================
+class RespuestaFixture:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+class SesionFixture:
+    # Imita requests.Session.get sirviendo las páginas de fixture por URL
+    def __init__(self, paginas):
+        self.paginas = paginas
+
+    def get(self, url, **kwargs):
+        return RespuestaFixture(self.paginas[url.rstrip("/").rsplit("/", 1)[-1]])
+
+def paginas_loto3(num_anios):
+    paginas = {}
+    for ruta in sorted(glob.glob(os.path.join(DIR_FIXTURES, "loto3_*.html"))):
+        anio = os.path.basename(ruta)[6:10]
+        with open(ruta, encoding="utf-8") as f:
+            paginas[anio] = f.read()
+    # Años extra generados al vuelo, como los de fixtures/
+    anio = 2022
+    while len(paginas) < num_anios:
+        paginas[str(anio)] = pagina_loto3(anio)
+        anio -= 1
+    return dict(sorted(paginas.items(), reverse=True)[:num_anios])
+
+def historial_sintetico(num_sorteos):
+    rng = np.random.default_rng(0)
+    fechas = pd.date_range("2000-01-01", periods=-(-num_sorteos // 3), freq="D").repeat(3)
+    return pd.DataFrame({
+        "Fecha": fechas[:num_sorteos],
+        "Turno": np.tile(["Día", "Tarde", "Noche"], len(fechas) // 3)[:num_sorteos],
+        "Último Número": rng.integers(0, 10, num_sorteos),
+    })
+
+def catalogo_movistar(num_skus, semilla=0):
+    return pd.DataFrame(tarjetas_movistar(num_skus, semilla))
+
+# =======================================
+# CASOS
+# =======================================
+@caso("parseo_anios", [1, 5, 10])
+def _parseo_anios(num_anios):
+    sesion = SesionFixture(paginas_loto3(num_anios))
+    anios = [int(a) for a in sesion.paginas]
+    return lambda: [extraer_resultados_por_anio(a, sesion) for a in anios]
+
+@caso("preparar_datos_lstm", [1_000, 10_000, 100_000])
+def _preparar(num_sorteos):
+    df = historial_sintetico(num_sorteos)
+    return lambda: preparar_datos_lstm(df, SEQ_LENGTH)
+
+@caso("monte_carlo", [5_000, 500_000, 5_000_000])
+def _monte_carlo(num_simulaciones):
+    probs = np.random.default_rng(0).dirichlet(np.ones(10))
+    rng = np.random.default_rng(0)
+    return lambda: simulacion_monte_carlo(probs, num_simulaciones, rng=rng)
+
+@caso("monte_carlo_muestras", [5_000, 500_000, 5_000_000])
+def _monte_carlo_muestras(num_simulaciones):
+    # Variante que genera cada muestra (analitica=False)
+    probs = np.random.default_rng(0).dirichlet(np.ones(10))
+    rng = np.random.default_rng(0)
+    return lambda: simulacion_monte_carlo(probs, num_simulaciones, rng=rng, analitica=False)
+
+@caso("prediccion_numpy", [1, 64, 1024], requiere=("h5py", "tensorflow"), tolerancia=0.2)
+def _prediccion_numpy(lote):
+    from predictor_numpy import PredictorNumPy
+    predictor = PredictorNumPy(*pesos_h5())
+    entrada = np.random.default_rng(0).integers(0, 10, (lote, SEQ_LENGTH))
+    return lambda: predictor.predecir(entrada)
+
+@caso("tf_construir_modelos", [SEQ_LENGTH], requiere=("tensorflow",), tolerancia=0.2)
+def _construir(seq_length):
+    from modelos import crear_modelo_lstm, crear_modelo_transformer
+    return lambda: (crear_modelo_lstm(seq_length), crear_modelo_transformer(seq_length))
+
+@caso("tf_load_weights", [SEQ_LENGTH], requiere=("h5py", "tensorflow"), tolerancia=0.2)
+def _load_weights(seq_length):
+    from modelos import crear_modelo_lstm, crear_modelo_transformer
+    modelos = (crear_modelo_lstm(seq_length), crear_modelo_transformer(seq_length))
+    rutas = pesos_h5()
+    return lambda: [m.load_weights(r) for m, r in zip(modelos, rutas)]
+
+@caso("tf_prediccion", [1, 64, 1024], requiere=("tensorflow",), tolerancia=0.2)
+def _prediccion_tf(lote):
+    from modelos import crear_modelo_lstm, crear_modelo_transformer, crear_predictor_ensamble
+    predictor = crear_predictor_ensamble(crear_modelo_lstm(SEQ_LENGTH),
+                                         crear_modelo_transformer(SEQ_LENGTH), SEQ_LENGTH)
+    entrada = np.random.default_rng(0).integers(0, 10, (lote, SEQ_LENGTH))
+    predictor(entrada)
+    return lambda: predictor(entrada)
+
+@caso("sheets_append", [10, 100, 1_000])
+def _sheets_append(num_filas):
+    filas = [["2024-01-01 14:15:00", i % 10, (i + 1) % 10, (i + 2) % 10, "2024-01-01"]
+             for i in range(num_filas)]
+
+    def correr():
+        hoja = HojaFalsa("results")
+        sumidero = SumideroSheets(lambda nombre: hoja, ruta=":memory:")
+        sumidero.encolar_varias("results", filas)
+        sumidero.vaciar()
+    return correr
+
+@caso("sheets_append_libro", [10, 100, 1_000])
+def _sheets_append_libro(num_filas):
+    hojas = ("loto3_dia", "loto3_tarde", "loto3_noche")
+
+    def correr():
+        libro = LibroFalso({h: HojaFalsa(h) for h in hojas})
+        sumidero = SumideroSheets(libro.worksheet, ruta=":memory:", abrir_libro=lambda: libro)
+        for h in hojas:
+            sumidero.encolar_varias(h, [["2024-01-01 14:15:00", i % 10, 1, 2, "2024-01-01"]
+                                        for i in range(num_filas)])
+        sumidero.vaciar()
+    return correr
+
+@caso("movistar_historico", [100, 1_000, 10_000])
+def _movistar_historico(num_skus):
+    anterior, actual = catalogo_movistar(num_skus, 0), catalogo_movistar(num_skus, 1)
+
+    def correr():
+        conn = abrir_precios(":memory:")
+        registrar_scraping(conn, anterior, "2024-01-01 00:00:00")
+        registrar_scraping(conn, actual, "2024-01-01 00:15:00")
+        conn.close()
+    return correr
+
+@caso("movistar_espejo", [100, 1_000, 10_000])
+def _movistar_espejo(num_skus):
+    # Sincronización con 1% de precios cambiados sobre una hoja ya escrita
+    anterior = catalogo_movistar(num_skus)
+    actual = anterior.copy()
+    cambiados = actual.index[::100]
+    actual.loc[cambiados, "precio_oferta"] = "$9.990"
+
+    def correr():
+        conn = sqlite3.connect(":memory:")
+        hoja = HojaFalsa("latest")
+        espejo = EspejoHoja(conn, "latest")
+        espejo.sincronizar(hoja, anterior)
+        espejo.sincronizar(hoja, actual)
+        conn.close()
+    return correr
+
+_pesos = {}
+
+def pesos_h5():
+    # Pesos aleatorios guardados una vez por ejecución (o los entrenados, si existen)
+    from modelos import RUTA_PESOS_LSTM, RUTA_PESOS_TRANS
+    if os.path.exists(RUTA_PESOS_LSTM) and os.path.exists(RUTA_PESOS_TRANS):
+        return RUTA_PESOS_LSTM, RUTA_PESOS_TRANS
+    if not _pesos:
+        from modelos import crear_modelo_lstm, crear_modelo_transformer
+        directorio = tempfile.mkdtemp()
+        for nombre, modelo in (("lstm", crear_modelo_lstm(SEQ_LENGTH)),
+                               ("trans", crear_modelo_transformer(SEQ_LENGTH))):
+            _pesos[nombre] = os.path.join(directorio, f"{nombre}.h5")
+            modelo.save_weights(_pesos[nombre])
+    return _pesos["lstm"], _pesos["trans"]
+
+# =======================================
+# MEDICIÓN
+# =======================================
+def medir(funcion, repeticiones, minimo_s=0.2):
+    # Una ronda: al menos `repeticiones` muestras y minimo_s de tiempo.
+    # Sin el recolector de ciclos durante la medición, como timeit: sus
+    # pasadas caen al azar en los casos que crean muchos objetos.
+    tiempos = []
+    gc.collect()
+    gc.disable()
+    try:
+        while len(tiempos) < repeticiones or sum(tiempos) < minimo_s and len(tiempos) < 1000:
+            inicio = time.perf_counter()
+            funcion()
+            tiempos.append(time.perf_counter() - inicio)
+    finally:
+        gc.enable()
+    return tiempos
+
+def _carga_calibracion():
+    lista = list(range(200_000, 0, -1))
+    matriz = np.arange(250 * 250, dtype=np.float64).reshape(250, 250)
+    sorted(lista)
+    matriz @ matriz
+
+def calibrar(repeticiones=5):
+    # Carga fija que sólo depende de la máquina: con pocos casos medidos escala
+    # los tiempos para que un runner más lento no parezca una regresión
+    _carga_calibracion()
+    return min(medir(_carga_calibracion, repeticiones, minimo_s=0.1)) * 1000
+
+def ejecutar(repeticiones, solo=None, rondas=5):
+    # Las rondas recorren todos los casos por turno: una racha de ruido en la
+    # máquina cae en una sola ronda de cada caso y la mediana la descarta
+    preparados = {}
+    for nombre, tamanos, requiere, preparar in CASOS:
+        if solo and not any(s in nombre for s in solo):
+            continue
+        faltan = [m for m in requiere if importlib.util.find_spec(m) is None]
+        if faltan:
+            print(f"⏭️ {nombre}: falta {', '.join(faltan)}")
+            continue
+        for tamano in tamanos:
+            # Los mensajes de los scripts no se mezclan con la tabla
+            with contextlib.redirect_stdout(io.StringIO()):
+                funcion = preparar(tamano)
+                funcion()
+            preparados[f"{nombre}[{tamano}]"] = funcion
+
+    calibraciones, rondas_ms = [], {clave: [] for clave in preparados}
+    for ronda in range(rondas):
+        calibraciones.append(calibrar())
+        with contextlib.redirect_stdout(io.StringIO()):
+            for clave, funcion in preparados.items():
+                tiempos = medir(funcion, repeticiones)
+                rondas_ms[clave].append((statistics.median(tiempos) * 1000, min(tiempos) * 1000,
+                                         len(tiempos)))
+    calibracion = statistics.median(calibraciones)
+    print(f"📐 Calibración de la máquina: {calibracion:.3f} ms ({rondas} rondas)")
+
+    resultados = {}
+    for clave, medidas in rondas_ms.items():
+        resultados[clave] = {
+            "ms_mediana": round(statistics.median(m[0] for m in medidas), 4),
+            "ms_min": round(min(m[1] for m in medidas), 4),
+            "muestras": sum(m[2] for m in medidas),
+            "calibracion_ms": round(calibracion, 4),
+        }
+        print(f"{clave:<32} {resultados[clave]['ms_mediana']:10.3f} ms "
+              f"(min {resultados[clave]['ms_min']:.3f}, n={resultados[clave]['muestras']})")
+    return resultados
+
+def comparar(resultados, baseline, tolerancia, minimo_ms=0.1, minimo_casos=5):
+    # Regresión: mediana de las rondas, por encima de la línea base en más de
+    # la tolerancia (la global o la del caso, la mayor) y en más de minimo_ms,
+    # para no saltar en casos de microsegundos. La deriva de la máquina se
+    # descuenta con la razón mediana de todos los casos medidos; con pocos
+    # casos (--solo) se usa la carga de calibración.
+    casos = {clave: (medida, baseline.get("casos", {}).get(clave))
+             for clave, medida in resultados.items()}
+    for clave, (_, base) in casos.items():
+        if base is None:
+            print(f"🆕 {clave}: sin línea base")
+    casos = {clave: par for clave, par in casos.items() if par[1] is not None}
+    if len(casos) >= minimo_casos:
+        escala = statistics.median(m["ms_mediana"] / b["ms_mediana"] for m, b in casos.values())
+        print(f"📐 Deriva de la máquina (razón mediana de {len(casos)} casos): x{escala:.2f}")
+    else:
+        escala = statistics.median(m["calibracion_ms"] / b.get("calibracion_ms", m["calibracion_ms"])
+                                   for m, b in casos.values()) if casos else 1.0
+        print(f"📐 Deriva de la máquina (calibración): x{escala:.2f}")
+
+    regresiones = []
+    for clave, (medida, base) in casos.items():
+        esperado = base["ms_mediana"] * escala
+        razon = medida["ms_mediana"] / esperado
+        admitida = max(tolerancia, TOLERANCIAS.get(clave.split("[")[0], 0.0))
+        empeora = razon > 1 + admitida and medida["ms_mediana"] - esperado > minimo_ms
+        marca = "❌" if empeora else "✅"
+        print(f"{marca} {clave:<32} {esperado:10.3f} → {medida['ms_mediana']:10.3f} ms "
+              f"(x{razon:.2f}, admite x{1 + admitida:.2f})")
+        if empeora:
+            regresiones.append(clave)
+    return regresiones
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeticiones", type=int, default=5,
+                        help="Muestras mínimas por caso en cada ronda")
+    parser.add_argument("--rondas", type=int, default=5,
+                        help="Pasadas por todos los casos; se compara la mediana")
+    parser.add_argument("--solo", nargs="+", help="Sólo los casos cuyo nombre contiene estos textos")
+    parser.add_argument("--baseline", default=RUTA_BASELINE)
+    parser.add_argument("--guardar", action="store_true", help="Escribe los resultados como línea base")
+    parser.add_argument("--comparar", action="store_true",
+                        help="Compara con la línea base; código 1 si hay regresiones")
+    parser.add_argument("--tolerancia", type=float, default=0.15,
+                        help="Empeoramiento relativo admitido de la mediana (0.15 = 15%%)")
+    parser.add_argument("--minimo-ms", type=float, default=0.1,
+                        help="Diferencia absoluta mínima para contar como regresión")
+    args = parser.parse_args()
+
+    resultados = ejecutar(args.repeticiones, args.solo, args.rondas)
+
+    if args.comparar:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regresiones = comparar(resultados, baseline, args.tolerancia, args.minimo_ms)
+        if regresiones:
+            print(f"❌ Regresiones: {', '.join(regresiones)}")
+            sys.exit(1)
+        print("✅ Sin regresiones frente a la línea base")
+
+    if args.guardar:
+        casos = {}
+        if args.solo and os.path.exists(args.baseline):
+            # Con --solo se actualizan sólo los casos medidos
+            with open(args.baseline) as f:
+                casos = json.load(f).get("casos", {})
+        casos.update(resultados)
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "entorno": {"python": platform.python_version(), "maquina": platform.machine(),
+                            "numpy": np.__version__, "pandas": pd.__version__},
+                "casos": dict(sorted(casos.items())),
+            }, f, indent=2)
+        print(f"💾 Línea base guardada en {args.baseline} ({len(casos)} casos)")
@@ -0,0 +1,76 @@
+# =======================================
+# FIXTURES HTML PARA BENCHMARKS
+# Réplica determinista del marcado de las páginas de archivo de
+# loterias.com (table.archives + ul.balls), con el relleno típico de la
+# página real (cabecera, menús, scripts), y catálogos sintéticos de
+# Movistar con las columnas de scrape_movistar, para medir sin red.
+# =======================================
+import os
+import random
+from datetime import date, timedelta
+
+DIR_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+MESES = ["ene.", "feb.", "mar.", "abr.", "may.", "jun.",
+         "jul.", "ago.", "sep.", "oct.", "nov.", "dic."]
+DIAS = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
+TURNOS = ["Día", "Tarde", "Noche"]
+
+def _relleno(rng, n):
+    enlaces = "".join(
+        f'<li class="menu-item"><a href="/seccion-{i}">Sección {i}</a></li>' for i in range(n)
+    )
+    script = "var _cfg=" + ",".join(str(rng.randint(0, 10**6)) for _ in range(n * 20)) + ";"
+    return f'<nav class="menu"><ul>{enlaces}</ul></nav><script>{script}</script>'
+
+def pagina_loto3(anio, hasta=None, semilla=0):
+    rng = random.Random(semilla * 10_000 + anio)
+    d = hasta or date(anio, 12, 31)
+    filas = []
+    while d.year == anio:
+        listas = "".join(
+            f'<ul class="balls"><li class="draw-name">{turno}</li>'
+            + "".join(f'<li class="ball">{rng.randint(0, 9)}</li>' for _ in range(3))
+            + "</ul>"
+            for turno in TURNOS
+        )
+        filas.append(
+            f'<tr><td><a href="/loto-3/resultados/{d.isoformat()}">'
+            f'<span class="day">{DIAS[d.weekday()]}</span> {d.day} {MESES[d.month - 1]} {d.year}'
+            f'</a></td><td>{listas}</td></tr>'
+        )
+        d -= timedelta(days=1)
+    return (
+        '<!DOCTYPE html><html lang="es"><head><meta charset="utf-8">'
+        f"<title>Resultados Loto 3 {anio}</title>{_relleno(rng, 200)}</head>"
+        f'<body><header>{_relleno(rng, 150)}</header><main><h1>Loto 3 {anio}</h1>'
+        '<table class="archives"><thead><tr><th>Fecha</th><th>Resultados</th></tr></thead>'
+        f'<tbody>{"".join(filas)}</tbody></table></main>'
+        f"<footer>{_relleno(rng, 150)}</footer></body></html>"
+    )
+
+MARCAS = ["Samsung", "Apple", "Xiaomi", "Motorola", "Honor", "Oppo", "Vivo", "Realme"]
+
+def tarjetas_movistar(n, semilla=0):
+    # Registros con las mismas columnas que devuelve scrape_movistar
+    rng = random.Random(semilla)
+    tarjetas = []
+    for i in range(n):
+        marca = MARCAS[i % len(MARCAS)]
+        precio = rng.randrange(49_990, 1_999_990, 1000)
+        tarjetas.append({
+            "timestamp": "",
+            "sku": str(4_000_000 + i),
+            "producto": f"{marca} Modelo {i} {rng.choice([64, 128, 256, 512])}GB",
+            "precio_oferta": "$" + f"{precio:,}".replace(",", "."),
+            "marca": marca,
+        })
+    return tarjetas
+
+if __name__ == "__main__":
+    os.makedirs(DIR_FIXTURES, exist_ok=True)
+    for anio in (2023, 2024):
+        ruta = os.path.join(DIR_FIXTURES, f"loto3_{anio}.html")
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(pagina_loto3(anio))
+        print(f"✅ {ruta}")
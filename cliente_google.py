@@ -0,0 +1,90 @@
+# =======================================
+# CLIENTE GOOGLE SHEETS COMPARTIDO
+# Autorización perezosa: nada toca la red hasta pedir el primer libro u
+# hoja. El access token se guarda en disco hasta que expira, de modo que
+# ejecuciones seguidas no repiten el intercambio OAuth, y los handles de
+# open_by_key/worksheet se reutilizan dentro del proceso.
+# =======================================
+import functools
+import json
+import os
+from datetime import datetime, timedelta
+
+import metricas
+
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive"
+]
+RUTA_TOKEN = os.environ.get("GOOGLE_TOKEN_CACHE", ".google_token.json")
+MARGEN_EXPIRACION = timedelta(minutes=5)
+
+_cliente_forzado = None
+
+# =======================================
+# CREDENCIALES Y TOKEN EN DISCO
+# =======================================
+def _leer_token(ruta, cuenta):
+    try:
+        with open(ruta) as f:
+            token = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if token.get("cuenta") != cuenta:
+        return None
+    expira = datetime.fromisoformat(token["expira"])
+    # google-auth trabaja con datetime UTC sin zona horaria
+    if expira - MARGEN_EXPIRACION <= datetime.utcnow():
+        return None
+    return token["token"], expira
+
+def _guardar_token(ruta, cuenta, creds):
+    datos = {"cuenta": cuenta, "token": creds.token, "expira": creds.expiry.isoformat()}
+    descriptor = os.open(ruta, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(descriptor, "w") as f:
+        json.dump(datos, f)
+
+def credenciales(info=None, ruta_token=RUTA_TOKEN):
+    from google.auth.transport.requests import Request
+    from google.oauth2.service_account import Credentials
+
+    print("🔐 Cargando credenciales desde GOOGLE_CREDENTIALS...")
+    info = info or json.loads(os.environ["GOOGLE_CREDENTIALS"])
+    creds = Credentials.from_service_account_info(info, scopes=SCOPES)
+    cuenta = info.get("client_email")
+
+    guardado = _leer_token(ruta_token, cuenta) if ruta_token else None
+    if guardado:
+        creds.token, creds.expiry = guardado
+        print("🔑 Token de acceso reutilizado desde disco")
+    else:
+        creds.refresh(Request())
+        if ruta_token:
+            _guardar_token(ruta_token, cuenta, creds)
+    return creds
+
+# =======================================
+# CLIENTE, LIBROS Y HOJAS (MEMOIZADOS)
+# =======================================
+@functools.lru_cache(maxsize=None)
+def cliente():
+    if _cliente_forzado is not None:
+        return _cliente_forzado
+    with metricas.tramo("sheets_auth"):
+        import gspread
+        return gspread.authorize(credenciales())
+
+@functools.lru_cache(maxsize=None)
+def libro(spreadsheet_id):
+    return cliente().open_by_key(spreadsheet_id)
+
+@functools.lru_cache(maxsize=None)
+def hoja(spreadsheet_id, nombre):
+    return libro(spreadsheet_id).worksheet(nombre)
+
+def usar_cliente(nuevo):
+    # Sustituye el cliente (p.ej. por uno falso con open_by_key) y limpia los handles
+    global _cliente_forzado
+    _cliente_forzado = nuevo
+    for funcion in (cliente, libro, hoja):
+        funcion.cache_clear()
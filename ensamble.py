@@ -0,0 +1,30 @@
+# =======================================
+# IMPORTS
+# =======================================
+import numpy as np
+
+# =======================================
+# ENSAMBLE
+# =======================================
+def ensemble_predict(preds_list):
+    avg = np.mean(preds_list, axis=0)
+    return np.argmax(avg, axis=1), np.max(avg, axis=1)
+
+
+# =======================================
+# MONTE CARLO
+# =======================================
+def _normalizar(probs):
+    probs = np.asarray(probs, dtype=np.float64)
+    return probs / probs.sum()
+
+
+def simulacion_monte_carlo(probs, num_simulaciones=5000, rng=None, analitica=True):
+    # Devuelve el conteo de apariciones de cada número. En modo analítico el
+    # conteo sale directamente de una multinomial, sin generar las muestras.
+    rng = rng if rng is not None else np.random.default_rng()
+    probs = _normalizar(probs)
+    if analitica:
+        return rng.multinomial(num_simulaciones, probs)
+    muestras = rng.choice(len(probs), size=num_simulaciones, p=probs)
+    return np.bincount(muestras, minlength=len(probs))
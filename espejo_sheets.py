@@ -0,0 +1,150 @@
+# =======================================
+# SINCRONIZACIÓN DE HOJAS POR DIFERENCIAS
+# Guarda en SQLite un espejo de lo último escrito en cada hoja (fila,
+# clave, valores) y, en vez de clear() + reescribir todo, compara por clave
+# (p.ej. sku) y envía sólo los rangos de filas que cambiaron en un único
+# batch_update. Las filas de claves que desaparecen se reutilizan para las
+# nuevas y lo que sobra al final se deja en blanco, sin que la hoja quede
+# vacía en ningún momento. Sin espejo (primera ejecución o caché perdida)
+# se lee la hoja una vez para reconstruirlo.
+# =======================================
+import json
+
+from sumidero_sheets import con_reintentos
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS espejo_hojas (
+    hoja    TEXT NOT NULL,
+    fila    INTEGER NOT NULL,
+    clave   TEXT,
+    valores TEXT NOT NULL,
+    PRIMARY KEY (hoja, fila)
+);
+"""
+
+# =======================================
+# RANGOS
+# =======================================
+def letra_columna(numero):
+    letras = ""
+    while numero:
+        numero, resto = divmod(numero - 1, 26)
+        letras = chr(ord("A") + resto) + letras
+    return letras
+
+def agrupar_rangos(escrituras, num_columnas):
+    # {fila: valores} -> [{"range": "A5:E7", "values": [...]}] con filas contiguas juntas
+    bloques = []
+    for fila in sorted(escrituras):
+        if bloques and bloques[-1][1] == fila - 1:
+            bloques[-1][1] = fila
+            bloques[-1][2].append(escrituras[fila])
+        else:
+            bloques.append([fila, fila, [escrituras[fila]]])
+    ultima = letra_columna(num_columnas)
+    return [{"range": f"A{ini}:{ultima}{fin}", "values": valores} for ini, fin, valores in bloques]
+
+# =======================================
+# DIFERENCIAS
+# =======================================
+def calcular_diferencias(espejo, encabezado, filas, ignorar=()):
+    # espejo: {fila: (clave, valores)} de lo que hay en la hoja (fila 1 = encabezado)
+    # filas: [(clave, valores)] en el orden deseado
+    # Devuelve ({fila: valores a escribir}, nuevo espejo)
+    comparables = [i for i, c in enumerate(encabezado) if c not in ignorar]
+
+    def comparable(valores):
+        return [valores[i] if i < len(valores) else "" for i in comparables]
+
+    escrituras, nuevo = {}, {1: (None, list(encabezado))}
+    if espejo.get(1, (None, None))[1] != list(encabezado):
+        escrituras[1] = list(encabezado)
+
+    ocupadas = {}
+    for fila, (clave, _) in espejo.items():
+        if fila > 1 and clave is not None and clave not in ocupadas:
+            ocupadas[clave] = fila
+
+    total = len(filas) + 1
+    por_ubicar = []
+    for clave, valores in filas:
+        fila = ocupadas.pop(clave, None)
+        if fila is None or fila > total:
+            por_ubicar.append((clave, valores))
+        elif comparable(espejo[fila][1]) == comparable(valores):
+            nuevo[fila] = espejo[fila]
+        else:
+            nuevo[fila] = (clave, valores)
+            escrituras[fila] = valores
+
+    # Las claves nuevas (y las que quedaron más allá del final) ocupan los huecos
+    huecos = [f for f in range(2, total + 1) if f not in nuevo]
+    for fila, (clave, valores) in zip(huecos, por_ubicar):
+        nuevo[fila] = (clave, valores)
+        if espejo.get(fila) != (clave, valores):
+            escrituras[fila] = valores
+
+    # Filas sobrantes al final: en blanco
+    for fila in range(total + 1, max(espejo, default=1) + 1):
+        if any(espejo.get(fila, (None, []))[1]):
+            escrituras[fila] = [""] * len(encabezado)
+    return escrituras, nuevo
+
+# =======================================
+# ESPEJO
+# =======================================
+class EspejoHoja:
+    def __init__(self, conn, hoja, clave="sku", dormir=None):
+        self.conn = conn
+        self.hoja = hoja
+        self.clave = clave
+        self.reintentos = {"dormir": dormir} if dormir else {}
+        self.conn.executescript(ESQUEMA)
+
+    def cargar(self):
+        return {
+            fila: (clave, json.loads(valores))
+            for fila, clave, valores in self.conn.execute(
+                "SELECT fila, clave, valores FROM espejo_hojas WHERE hoja = ?", (self.hoja,)
+            )
+        }
+
+    def desde_hoja(self, worksheet):
+        # Reconstrucción del espejo con una sola lectura de la hoja
+        filas = con_reintentos(worksheet.get_all_values, **self.reintentos)
+        if not filas:
+            return {}
+        encabezado = filas[0]
+        indice = encabezado.index(self.clave) if self.clave in encabezado else None
+        espejo = {1: (None, encabezado)}
+        for fila, valores in enumerate(filas[1:], start=2):
+            clave = valores[indice] if indice is not None and indice < len(valores) else None
+            espejo[fila] = (clave or None, valores)
+        return espejo
+
+    def guardar(self, espejo):
+        with self.conn:
+            self.conn.execute("DELETE FROM espejo_hojas WHERE hoja = ?", (self.hoja,))
+            self.conn.executemany(
+                "INSERT INTO espejo_hojas (hoja, fila, clave, valores) VALUES (?, ?, ?, ?)",
+                [(self.hoja, fila, clave, json.dumps(valores))
+                 for fila, (clave, valores) in espejo.items()],
+            )
+
+    def sincronizar(self, worksheet, df, ignorar=()):
+        # Devuelve la cantidad de filas escritas
+        encabezado = [str(c) for c in df.columns]
+        valores = df.astype(object).where(df.notna(), "").astype(str).values.tolist()
+        indice = encabezado.index(self.clave)
+        filas = [(fila[indice], fila) for fila in valores]
+
+        espejo = self.cargar() or self.desde_hoja(worksheet)
+        escrituras, nuevo = calcular_diferencias(espejo, encabezado, filas, ignorar)
+        if escrituras:
+            rangos = agrupar_rangos(escrituras, len(encabezado))
+            con_reintentos(lambda: worksheet.batch_update(rangos), **self.reintentos)
+            print(f"📝 {self.hoja}: {len(escrituras)} fila(s) escritas en {len(rangos)} rango(s)")
+        else:
+            print(f"💤 {self.hoja}: sin cambios")
+        self.guardar(nuevo)
+        return len(escrituras)
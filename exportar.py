@@ -0,0 +1,64 @@
+# =======================================
+# EXPORTACIÓN DE ARTEFACTOS DE INFERENCIA
+# El ensamble se congela en un flatbuffer TFLite con una firma que
+# devuelve las dos distribuciones; main.py lo carga con tflite_runtime
+# (o tf.lite si no está instalado) sin reconstruir los modelos Keras.
+# =======================================
+import tensorflow as tf
+
+from modelos import crear_modelo_ensamble, crear_modelo_lstm
+from predictor_tflite import RUTA_TFLITE, ruta_artefacto
+
+def firma_ensamble(ensamble, seq_length=10):
+    # Lote fijo de 1 al convertir (forma estática); PredictorTFLite invoca
+    # el intérprete una vez por fila.
+    @tf.function(input_signature=[tf.TensorSpec([1, seq_length], tf.int32, name="secuencia")])
+    def predecir(secuencia):
+        p_lstm, p_trans = ensamble(secuencia, training=False)
+        return {"lstm": p_lstm, "transformer": p_trans}
+    return predecir.get_concrete_function()
+
+def convertir_tflite(ensamble, seq_length=10, optimizaciones=None, tipos_soportados=None,
+                     dataset_representativo=None):
+    converter = tf.lite.TFLiteConverter.from_concrete_functions(
+        [firma_ensamble(ensamble, seq_length)], ensamble
+    )
+    if optimizaciones:
+        converter.optimizations = optimizaciones
+    if tipos_soportados:
+        converter.target_spec.supported_types = tipos_soportados
+    if dataset_representativo is not None:
+        converter.representative_dataset = dataset_representativo
+    return converter.convert()
+
+def opciones_cuantizacion(modo="float32"):
+    # Cuantización post-entrenamiento de pesos (Embedding, LSTM, Dense y
+    # MultiHeadAttention); las activaciones siguen en float32.
+    if modo == "float32":
+        return {}
+    if modo == "float16":
+        return {"optimizaciones": [tf.lite.Optimize.DEFAULT], "tipos_soportados": [tf.float16]}
+    if modo == "int8":
+        return {"optimizaciones": [tf.lite.Optimize.DEFAULT]}
+    raise ValueError(f"Modo de cuantización desconocido: {modo}")
+
+def lstm_desenrollada(modelo_lstm, seq_length=10):
+    # Mismos pesos sin bucle while. La LSTM fusionada de TFLite arrastra el
+    # estado entre invocaciones del intérprete y el cuantizador float16 no
+    # termina con ella; con seq_length pasos fijos el bucle no hace falta.
+    copia = crear_modelo_lstm(seq_length, unroll=True)
+    copia.set_weights(modelo_lstm.get_weights())
+    return copia
+
+def exportar_tflite(modelo_lstm, modelo_trans, seq_length=10, ruta=RUTA_TFLITE, modos=("float32",)):
+    lstm = lstm_desenrollada(modelo_lstm, seq_length)
+    rutas = {}
+    for modo in modos:
+        ensamble = crear_modelo_ensamble(lstm, modelo_trans, seq_length)
+        contenido = convertir_tflite(ensamble, seq_length, **opciones_cuantizacion(modo))
+        rutas[modo] = ruta_artefacto(modo, ruta)
+        with open(rutas[modo], "wb") as f:
+            f.write(contenido)
+        print(f"📦 Artefacto de inferencia ({modo}) exportado en {rutas[modo]} "
+              f"({len(contenido) / 1024:.0f} KB)")
+    return rutas
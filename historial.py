@@ -0,0 +1,149 @@
+# =======================================
+# IMPORTS
+# =======================================
+import os
+import sqlite3
+import pandas as pd
+from datetime import datetime
+
+from resultados import COLUMNAS, extraer_resultados_anios
+
+# =======================================
+# CONFIG
+# =======================================
+# Histórico local de sorteos, clave (Fecha, Turno). Los años pasados ya no
+# cambian, así que sólo se vuelven a descargar el año en curso y los años
+# que todavía no están completos en el archivo.
+RUTA_HISTORIAL = os.environ.get("LOTO3_HISTORIAL", "historial_loto3.sqlite")
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS sorteos (
+    fecha TEXT NOT NULL,
+    turno TEXT NOT NULL,
+    num1 INTEGER NOT NULL,
+    num2 INTEGER NOT NULL,
+    num3 INTEGER NOT NULL,
+    PRIMARY KEY (fecha, turno)
+);
+CREATE TABLE IF NOT EXISTS anios_completos (
+    anio INTEGER PRIMARY KEY,
+    actualizado TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS validadores (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT
+);
+"""
+
+# =======================================
+# ACCESO AL HISTÓRICO
+# =======================================
+def abrir_historial(ruta=RUTA_HISTORIAL):
+    conn = sqlite3.connect(ruta)
+    conn.executescript(ESQUEMA)
+    return conn
+
+def guardar_resultados(conn, df):
+    if df.empty:
+        return 0
+    filas = [
+        (fecha.strftime("%Y-%m-%d"), turno, int(n1), int(n2), int(n3))
+        for fecha, turno, n1, n2, n3 in zip(
+            df["Fecha"], df["Turno"], df["Num1"], df["Num2"], df["Num3"]
+        )
+    ]
+    # Los sorteos publicados no cambian: sólo se insertan filas nuevas y el
+    # rowid conserva el orden Día/Tarde/Noche dentro de una misma fecha.
+    antes = conn.total_changes
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO sorteos (fecha, turno, num1, num2, num3) "
+            "VALUES (?, ?, ?, ?, ?)",
+            filas,
+        )
+    return conn.total_changes - antes
+
+def leer_historial(conn, desde=None):
+    consulta = "SELECT fecha, turno, num1, num2, num3 FROM sorteos"
+    params = ()
+    if desde is not None:
+        consulta += " WHERE fecha >= ?"
+        params = (desde,)
+    consulta += " ORDER BY fecha, rowid"
+
+    df = pd.DataFrame(
+        conn.execute(consulta, params).fetchall(),
+        columns=["Fecha", "Turno", "Num1", "Num2", "Num3"],
+    )
+    df["Fecha"] = pd.to_datetime(df["Fecha"])
+    df["Último Número"] = df["Num3"]
+    return df[COLUMNAS]
+
+def anios_completos(conn):
+    return {fila[0] for fila in conn.execute("SELECT anio FROM anios_completos")}
+
+def marcar_anio_completo(conn, anio):
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO anios_completos (anio, actualizado) VALUES (?, ?)",
+            (anio, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+        )
+
+def leer_validadores(conn):
+    return {
+        url: {"etag": etag, "last_modified": last_modified}
+        for url, etag, last_modified in conn.execute(
+            "SELECT url, etag, last_modified FROM validadores"
+        )
+    }
+
+def guardar_validadores(conn, validadores):
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO validadores (url, etag, last_modified) VALUES (?, ?, ?)",
+            [(url, v.get("etag"), v.get("last_modified")) for url, v in validadores.items()],
+        )
+
+# =======================================
+# ACTUALIZACIÓN INCREMENTAL
+# =======================================
+def actualizar_historial(num_anios=10, ruta=RUTA_HISTORIAL, max_workers=4):
+    año_actual = datetime.now().year
+    años = list(range(año_actual, año_actual - num_anios, -1))
+
+    conn = abrir_historial(ruta)
+    try:
+        completos = anios_completos(conn)
+        pendientes = [a for a in años if a == año_actual or a not in completos]
+        print(f"📚 Histórico local: {len(años) - len(pendientes)} años en caché, "
+              f"{len(pendientes)} por descargar")
+
+        descargados, errores, validadores = extraer_resultados_anios(
+            pendientes, max_workers=max_workers, validadores=leer_validadores(conn)
+        )
+
+        for anio in pendientes:
+            if anio not in descargados:
+                continue
+            df = descargados[anio]
+            if df is None:
+                print(f"💤 {anio} sin cambios desde la última descarga")
+                if anio < año_actual:
+                    marcar_anio_completo(conn, anio)
+                continue
+            nuevos = guardar_resultados(conn, df)
+            if nuevos:
+                print(f"➕ {nuevos} sorteos nuevos de {anio}")
+            # Un año pasado descargado sin errores ya no volverá a cambiar
+            if anio < año_actual and not df.empty:
+                marcar_anio_completo(conn, anio)
+
+        guardar_validadores(conn, validadores)
+        if errores:
+            print(f"⚠️ Años con error, se reintentarán en la próxima ejecución: "
+                  f"{sorted(errores)}")
+
+        return leer_historial(conn, desde=f"{años[-1]}-01-01")
+    finally:
+        conn.close()
@@ -0,0 +1,202 @@
+# =======================================
+# HOJA FALSA (EN MEMORIA)
+# Imita la parte de la interfaz de gspread.Worksheet que usan los scripts
+# (append_row(s), get_all_values, col_values, get, batch_get, update,
+# batch_update) para probar y medir sin red. Puede simular respuestas 429/5xx.
+# =======================================
+import re
+from datetime import datetime, timedelta
+
+class RespuestaFalsa:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+class ErrorAPIFalso(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"APIError falso {status_code}")
+        self.response = RespuestaFalsa(status_code, headers)
+
+def _columna_a_indice(letras):
+    indice = 0
+    for letra in letras.upper():
+        indice = indice * 26 + ord(letra) - ord("A") + 1
+    return indice
+
+def parsear_rango(rango):
+    # "A2:D10", "B5", "A:A" o "2:4" -> (fila_ini, col_ini, fila_fin, col_fin), 1-based;
+    # None en los extremos abiertos
+    rango = rango.split("!")[-1]
+    extremos = []
+    for parte in rango.split(":"):
+        m = re.fullmatch(r"([A-Za-z]*)(\d*)", parte)
+        letras, numero = m.groups()
+        extremos.append((int(numero) if numero else None,
+                         _columna_a_indice(letras) if letras else None))
+    if len(extremos) == 1:
+        extremos.append(extremos[0])
+    (f1, c1), (f2, c2) = extremos
+    return f1, c1, f2, c2
+
+class HojaFalsa:
+    def __init__(self, title="hoja", filas=None, fallos=None, id=0):
+        self.title = title
+        self.id = id
+        self.filas = [list(map(str, f)) for f in (filas or [])]
+        # Códigos HTTP a devolver en las próximas llamadas (p.ej. [429, 429])
+        self.fallos = list(fallos or [])
+        self.llamadas = []
+
+    def _llamada(self, nombre):
+        self.llamadas.append(nombre)
+        if self.fallos:
+            raise ErrorAPIFalso(self.fallos.pop(0))
+
+    # ----- Lectura -----
+    def get_all_values(self):
+        self._llamada("get_all_values")
+        return [list(f) for f in self.filas]
+
+    def col_values(self, col, value_render_option="FORMATTED_VALUE"):
+        self._llamada("col_values")
+        valores = [f[col - 1] if len(f) >= col else "" for f in self.filas]
+        if value_render_option == "UNFORMATTED_VALUE":
+            return [_sin_formato(v) for v in valores]
+        return valores
+
+    def row_values(self, fila):
+        self._llamada("row_values")
+        return list(self.filas[fila - 1]) if fila <= len(self.filas) else []
+
+    def get(self, rango):
+        self._llamada("get")
+        return self._leer(rango)
+
+    def batch_get(self, rangos, **kwargs):
+        self._llamada("batch_get")
+        return [self._leer(r) for r in rangos]
+
+    def get_values(self, rango=None):
+        self._llamada("get_values")
+        return self._leer(rango) if rango else [list(f) for f in self.filas]
+
+    def _leer(self, rango):
+        f1, c1, f2, c2 = parsear_rango(rango)
+        f1, f2 = (f1 or 1), (f2 or len(self.filas))
+        resultado = []
+        for fila in self.filas[f1 - 1:f2]:
+            resultado.append(fila[(c1 or 1) - 1:c2] if c2 else fila[(c1 or 1) - 1:])
+        # gspread omite las filas vacías del final
+        while resultado and not any(resultado[-1]):
+            resultado.pop()
+        return resultado
+
+    # ----- Escritura -----
+    def append_row(self, valores, value_input_option="RAW", **kwargs):
+        self._llamada("append_row")
+        self.filas.append([str(v) for v in valores])
+
+    def append_rows(self, valores, value_input_option="RAW", **kwargs):
+        self._llamada("append_rows")
+        if value_input_option == "USER_ENTERED":
+            # Como Sheets: "007" o "1.50" se guardan como número ("7", "1.5")
+            self.filas.extend([_numero_mostrado(v) for v in fila] for fila in valores)
+        else:
+            self.filas.extend([str(v) for v in fila] for fila in valores)
+
+    def update(self, values=None, range_name=None, **kwargs):
+        # Firma de gspread 6: valores primero, rango después (None = A1)
+        self._llamada("update")
+        self._escribir(range_name or "A1", values)
+
+    def batch_update(self, datos, **kwargs):
+        self._llamada("batch_update")
+        for bloque in datos:
+            self._escribir(bloque["range"], bloque["values"])
+
+    def clear(self):
+        self._llamada("clear")
+        self.filas = []
+
+    def _escribir(self, rango, valores):
+        f1, c1, _, _ = parsear_rango(rango)
+        f1, c1 = f1 or 1, c1 or 1
+        for i, fila in enumerate(valores):
+            destino = f1 - 1 + i
+            while len(self.filas) <= destino:
+                self.filas.append([])
+            actual = self.filas[destino]
+            while len(actual) < c1 - 1 + len(fila):
+                actual.append("")
+            actual[c1 - 1:c1 - 1 + len(fila)] = [str(v) for v in fila]
+
+def _numero_mostrado(valor):
+    texto = str(valor)
+    try:
+        numero = float(texto)
+    except ValueError:
+        return texto
+    return str(int(numero)) if numero.is_integer() else repr(numero)
+
+def _sin_formato(texto):
+    # UNFORMATTED_VALUE: fechas como serial de Sheets, números como número
+    for formato in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+        try:
+            return (datetime.strptime(texto, formato) - datetime(1899, 12, 30)).total_seconds() / 86400
+        except ValueError:
+            pass
+    try:
+        numero = float(texto)
+    except ValueError:
+        return texto
+    return int(numero) if numero.is_integer() else numero
+
+def _valor_celda(celda):
+    # Inversa de sumidero_sheets.celda_sheets, para leer lo escrito con appendCells
+    valor = next(iter(celda.get("userEnteredValue", {"stringValue": ""}).values()))
+    tipo = celda.get("userEnteredFormat", {}).get("numberFormat", {}).get("type")
+    if tipo in ("DATE", "DATE_TIME"):
+        fecha = datetime(1899, 12, 30) + timedelta(days=valor)
+        return fecha.strftime("%Y-%m-%d %H:%M:%S" if tipo == "DATE_TIME" else "%Y-%m-%d")
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return str(valor)
+
+class LibroFalso:
+    # Imita gspread.Spreadsheet: worksheet(nombre), add_worksheet y
+    # batch_update con peticiones appendCells
+    def __init__(self, hojas=None, fallos=None):
+        self.hojas = dict(hojas or {})
+        for i, hoja in enumerate(self.hojas.values()):
+            hoja.id = i
+        self.fallos = list(fallos or [])
+        self.llamadas = []
+
+    def worksheet(self, nombre):
+        if nombre not in self.hojas:
+            self.hojas[nombre] = HojaFalsa(nombre, id=len(self.hojas))
+        return self.hojas[nombre]
+
+    def batch_update(self, cuerpo):
+        self.llamadas.append("batch_update")
+        if self.fallos:
+            raise ErrorAPIFalso(self.fallos.pop(0))
+        por_id = {hoja.id: hoja for hoja in self.hojas.values()}
+        for peticion in cuerpo["requests"]:
+            datos = peticion["appendCells"]
+            por_id[datos["sheetId"]].filas.extend(
+                [_valor_celda(c) for c in fila["values"]] for fila in datos["rows"]
+            )
+
+    def add_worksheet(self, title, rows=1000, cols=26, **kwargs):
+        return self.worksheet(title)
+
+class ClienteFalso:
+    # Imita gspread.Client.open_by_key; para cliente_google.usar_cliente
+    def __init__(self, libros=None):
+        self.libros = dict(libros or {})
+
+    def open_by_key(self, clave):
+        if clave not in self.libros:
+            self.libros[clave] = LibroFalso()
+        return self.libros[clave]
@@ -0,0 +1,140 @@
+# =======================================
+# RECOLECTOR LOTO 3 (TODOS LOS TURNOS)
+# Descarga y parsea una sola vez la página del año en curso, toma el último
+# sorteo de cada turno pedido y los registra en sus hojas en un solo envío.
+#   python loto3.py                      (día, tarde y noche)
+#   python loto3.py --turnos dia tarde
+# =======================================
+import argparse
+import functools
+from datetime import datetime, timedelta
+
+import cliente_google
+import metricas
+from parseo import parsear_sorteos, ultimo_sorteo
+from resultados import URL_ANIO, crear_sesion, descargar_pagina
+from sumidero_sheets import SumideroSheets
+
+# =======================================
+# CONFIG
+# =======================================
+# turno -> (posición del sorteo en la fila de la web, hoja de destino)
+TURNOS = {
+    "dia": (0, "loto3_dia"),
+    "tarde": (1, "loto3_tarde"),
+    "noche": (2, "loto3_noche"),
+}
+ENCABEZADO = ["FechaHora", "Num1", "Num2", "Num3", "FechaSorteo"]
+
+# =======================================
+# GOOGLE SHEETS
+# =======================================
+SPREADSHEET_ID = "1QYwk8uKydO-xp0QALkh0pVVFmt50jnvU_BwZdRghES0"
+
+@functools.lru_cache(maxsize=None)
+def sumidero():
+    # Se crea al primer uso: importar el módulo no autoriza ni abre la hoja
+    return SumideroSheets(
+        lambda nombre: cliente_google.hoja(SPREADSHEET_ID, nombre),
+        abrir_libro=lambda: cliente_google.libro(SPREADSHEET_ID),
+    )
+
+# =======================================
+# SCRAPING (UNA PÁGINA PARA TODOS LOS TURNOS)
+# =======================================
+def obtener_ultimos_sorteos(turnos, anio=None):
+    anio = anio or datetime.now().year
+    print(f"🔎 Obteniendo últimos números del Loto 3 del año {anio}...")
+    html, _ = descargar_pagina(crear_sesion(max_conexiones=1), URL_ANIO.format(anio=anio))
+    with metricas.tramo("parseo_html"):
+        sorteos = parsear_sorteos(html)
+
+    ultimos = {}
+    for turno in turnos:
+        posicion, _ = TURNOS[turno]
+        try:
+            ultimos[turno] = ultimo_sorteo(sorteos, posicion=posicion)
+        except ValueError:
+            print(f"⚠️ Sin sorteos de {turno} en la página de {anio}")
+    return ultimos
+
+# =======================================
+# APPEND A GOOGLE SHEETS
+# =======================================
+def fecha_sorteo_legada(fecha_hora):
+    # Filas antiguas sin FechaSorteo: FechaHora es la hora UTC de la ejecución.
+    # El turno noche (21:15 CL) corría a las 00:15/01:15 UTC del día siguiente,
+    # así que antes de las 04:00 UTC el sorteo es del día anterior.
+    ejecucion = datetime.strptime(fecha_hora[:19], "%Y-%m-%d %H:%M:%S")
+    if ejecucion.hour < 4:
+        ejecucion -= timedelta(days=1)
+    return ejecucion.strftime("%Y-%m-%d")
+
+def sincronizar_indice(worksheet_name):
+    # Sólo cuando el índice local no conoce la hoja (spool nuevo): una
+    # lectura de las columnas FechaHora y FechaSorteo.
+    worksheet = cliente_google.hoja(SPREADSHEET_ID, worksheet_name)
+    with metricas.tramo("sheets_indice"):
+        col_fecha_hora, col_fecha_sorteo = worksheet.batch_get(["A:A", "E:E"])
+    claves = []
+    for i, fila in enumerate(col_fecha_hora[1:], start=1):
+        if not fila:
+            continue
+        sorteo = col_fecha_sorteo[i] if i < len(col_fecha_sorteo) else []
+        try:
+            fecha = sorteo[0] if sorteo else fecha_sorteo_legada(fila[0])
+        except ValueError:
+            fecha = fila[0][:10]
+        claves.append(f"{worksheet_name}|{fecha}")
+    if not col_fecha_hora:
+        sumidero().encolar(worksheet_name, ENCABEZADO, f"{worksheet_name}|encabezado")
+    elif not col_fecha_sorteo:
+        # Hoja anterior a la columna FechaSorteo: se completa el encabezado
+        worksheet.update(values=[[ENCABEZADO[4]]], range_name="E1")
+    sumidero().registrar_existentes(worksheet_name, claves, len(col_fecha_hora))
+
+def encolar_sorteo(worksheet_name, fecha, numeros, fecha_hora):
+    fecha_sorteo = fecha.strftime("%Y-%m-%d")
+
+    # Duplicados por fecha del sorteo contra el índice local, sin leer la hoja
+    clave = f"{worksheet_name}|{fecha_sorteo}"
+    if not sumidero().hoja_sincronizada(worksheet_name):
+        sincronizar_indice(worksheet_name)
+    if sumidero().registrado(clave):
+        print(f"⚠️ Sorteo del {fecha_sorteo} ya registrado en {worksheet_name}.")
+        return False
+
+    sumidero().encolar(worksheet_name, [fecha_hora] + numeros + [fecha_sorteo], clave)
+    print(f"✅ Últimos números obtenidos en {worksheet_name}:", numeros, "Sorteo:", fecha_sorteo)
+    return True
+
+def registrar_sorteos(ultimos):
+    fecha_hora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    nuevos = [turno for turno, (fecha, numeros) in ultimos.items()
+              if encolar_sorteo(TURNOS[turno][1], fecha, numeros, fecha_hora)]
+    # Todas las hojas en un solo envío (con reintentos y spool si falla)
+    with metricas.tramo("sheets_envio"):
+        sumidero().intentar_vaciar()
+    return nuevos
+
+# =======================================
+# MAIN
+# =======================================
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turnos", nargs="+", choices=list(TURNOS), default=list(TURNOS))
+    args, _ = parser.parse_known_args(argv)
+    metricas.iniciar("loto3", turnos=args.turnos)
+
+    # Sólo el envío a Sheets es tolerante (intentar_vaciar deja las filas en
+    # el spool); un fallo al descargar, parsear o indexar se propaga: código 1
+    # para el workflow y estado "error" en metricas.jsonl.
+    try:
+        ultimos = obtener_ultimos_sorteos(args.turnos)
+        registrar_sorteos(ultimos)
+    except Exception as e:
+        print(f"❌ Error al obtener o registrar los sorteos ({', '.join(args.turnos)}):", str(e))
+        raise
+
+if __name__ == "__main__":
+    main()
@@ -1,103 +1,11 @@
 # =======================================
-# IMPORTS
+# LOTO 3 NOCHE
+# Se mantiene por compatibilidad: equivale a
+#   python loto3.py --turnos noche
 # =======================================
-import os
-import json
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime
-import gspread
-from google.oauth2.service_account import Credentials
+import sys
 
-# =======================================
-# GOOGLE SHEETS
-# =======================================
-def cargar_credenciales_google():
-    creds_dict = json.loads(os.environ["GOOGLE_CREDENTIALS"])
-    creds = Credentials.from_service_account_info(
-        creds_dict,
-        scopes=[
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive"
-        ]
-    )
-    return gspread.authorize(creds)
-
-SPREADSHEET_ID = "1QYwk8uKydO-xp0QALkh0pVVFmt50jnvU_BwZdRghES0"
-gc = cargar_credenciales_google()
-
-# =======================================
-# SCRAPING ÚLTIMO SORTEO NOCHE
-# =======================================
-MESES = {
-    "ene.": "01", "feb.": "02", "mar.": "03", "abr.": "04",
-    "may.": "05", "jun.": "06", "jul.": "07", "ago.": "08",
-    "sep.": "09", "oct.": "10", "nov.": "11", "dic.": "12",
-}
-
-def corregir_fecha(fecha_str):
-    for mes_abrev, mes_num in MESES.items():
-        if mes_abrev in fecha_str:
-            fecha_str = fecha_str.replace(mes_abrev, mes_num)
-            return datetime.strptime(fecha_str, "%d %m %Y")
-    raise ValueError(f"Mes no reconocido en fecha '{fecha_str}'")
-
-def obtener_ultimo_sorteo_noche():
-    año_actual = datetime.now().year
-    url = f"https://www.loterias.com/loto-3/resultados/{año_actual}"
-    print(f"🔎 Obteniendo últimos números del Loto 3 Noche del año {año_actual}...")
-
-    resp = requests.get(url, timeout=10)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
-
-    tabla = soup.find("table", class_="archives")
-    if not tabla:
-        raise ValueError("No se encontró la tabla de resultados en la web")
+from loto3 import main
 
-    # Buscamos la **última fila que tenga 3 sets de números**
-    filas = tabla.tbody.find_all("tr")
-    for fila in filas:
-        celdas = fila.find_all("td")
-        if len(celdas) < 2:
-            continue
-        listas = celdas[1].find_all("ul", class_="balls")
-        if len(listas) >= 3:
-            # Extraemos los números Noche (tercer set)
-            numeros_noche = [int(li.text.strip()) for li in listas[2].find_all("li", class_="ball")]
-            return datetime.now(), numeros_noche  # Fecha/hora de ejecución
-
-    raise ValueError("No se encontraron números del sorteo Noche en las filas disponibles")
-
-# =======================================
-# APPEND A GOOGLE SHEETS
-# =======================================
-def append_ultimo_sorteo(worksheet_name, numeros):
-    worksheet = gc.open_by_key(SPREADSHEET_ID).worksheet(worksheet_name)
-    fecha_hora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    registros = worksheet.get_all_values()
-    if len(registros) == 0:
-        worksheet.append_row(["FechaHora", "Num1", "Num2", "Num3"], value_input_option="USER_ENTERED")
-        registros = worksheet.get_all_values()
-
-    # Evitamos duplicados
-    for fila in registros[1:]:
-        if fila[0] == fecha_hora:
-            print(f"⚠️ Sorteo ya registrado en {worksheet_name}.")
-            return
-
-    fila = [fecha_hora] + numeros
-    worksheet.append_row(fila, value_input_option="USER_ENTERED")
-    print(f"✅ Últimos números obtenidos en {worksheet_name}:", numeros, "Fecha/hora:", fecha_hora)
-
-# =======================================
-# MAIN
-# =======================================
 if __name__ == "__main__":
-    try:
-        print("🔎 Obteniendo últimos números del Loto 3 Noche...")
-        fecha, numeros_noche = obtener_ultimo_sorteo_noche()
-        append_ultimo_sorteo("loto3_noche", numeros_noche)
-    except Exception as e:
-        print("❌ Error al obtener o registrar el sorteo Noche:", str(e))
+    main(["--turnos", "noche"] + sys.argv[1:])
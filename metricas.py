@@ -0,0 +1,214 @@
+# =======================================
+# MÉTRICAS DE EJECUCIÓN
+# Tramos con "with tramo('nombre'):" que registran tiempo real, tiempo de
+# CPU y memoria (RSS actual y pico dentro del tramo) de cada etapa. Al
+# terminar el script se agrega un registro JSON por ejecución a RUTA_METRICAS.
+#   LOTO3_METRICAS=metricas.jsonl   destino del registro ("" lo desactiva)
+#   LOTO3_PERFILADO=cprofile        guarda un .prof y muestra las funciones más costosas
+#   LOTO3_PERFILADO=tf              traza del profiler de TensorFlow (TensorBoard)
+# =======================================
+import atexit
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+RUTA_METRICAS = os.environ.get("LOTO3_METRICAS", "metricas.jsonl")
+PERFILADO = os.environ.get("LOTO3_PERFILADO", "")
+DIRECTORIO_PERFILES = os.environ.get("LOTO3_PERFILES", "perfiles")
+
+_tramos = []
+_pila = threading.local()
+_candado = threading.Lock()
+_ejecucion = {}
+# Pico de cada tramo abierto (por id del registro) y pico total de la ejecución
+_picos = {}
+_pico_total = [0.0]
+
+# =======================================
+# MEMORIA
+# =======================================
+def rss_mb():
+    # Memoria residente actual del proceso (Linux); 0 si no está disponible
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return 0.0
+
+def _pico_desde_reinicio_mb():
+    # VmHWM: pico de RSS desde el inicio o desde el último reinicio de clear_refs
+    try:
+        with open("/proc/self/status") as f:
+            for linea in f:
+                if linea.startswith("VmHWM:"):
+                    return int(linea.split()[1]) / 2**10
+    except (OSError, ValueError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss viene en KB en Linux y en bytes en macOS
+    return pico / 2**20 if sys.platform == "darwin" else pico / 2**10
+
+def _reiniciar_pico():
+    # Escribir "5" en clear_refs reinicia VmHWM (y ru_maxrss) al RSS actual
+    # (Linux >= 4.0); sin ese archivo el pico queda como el de todo el proceso
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+def _acumular_pico():
+    # Reparte el pico desde el último reinicio entre los tramos abiertos
+    pico = _pico_desde_reinicio_mb()
+    for clave in _picos:
+        _picos[clave] = max(_picos[clave], pico)
+    _pico_total[0] = max(_pico_total[0], pico)
+    return pico
+
+def rss_pico_mb():
+    # Pico de RSS de toda la ejecución, también tras reinicios de los tramos
+    with _candado:
+        _acumular_pico()
+        return _pico_total[0]
+
+# =======================================
+# TRAMOS
+# =======================================
+@contextmanager
+def tramo(nombre):
+    # Los tramos anidados se nombran "padre/hijo"; cada hilo lleva su propia pila.
+    # En el hilo principal cpu_s es la CPU de todo el proceso (incluye los
+    # hilos de TensorFlow); en otros hilos (p.ej. descargas en paralelo) es
+    # sólo la del hilo, para no sumar la de los demás.
+    pila = getattr(_pila, "nombres", None)
+    if pila is None:
+        pila = _pila.nombres = []
+    pila.append(nombre)
+    registro = {"tramo": "/".join(pila)}
+    reloj_cpu = (time.process_time if threading.current_thread() is threading.main_thread()
+                 else time.thread_time)
+    rss_inicial = rss_mb()
+    with _candado:
+        _acumular_pico()
+        _reiniciar_pico()
+        _picos[id(registro)] = rss_inicial
+    inicio, inicio_cpu = time.perf_counter(), reloj_cpu()
+    try:
+        yield registro
+    except BaseException as e:
+        registro["error"] = type(e).__name__
+        raise
+    finally:
+        pila.pop()
+        wall, cpu = time.perf_counter() - inicio, reloj_cpu() - inicio_cpu
+        rss_final = rss_mb()
+        with _candado:
+            _acumular_pico()
+            pico = _picos.pop(id(registro))
+        registro.update({
+            "wall_s": round(wall, 6),
+            "cpu_s": round(cpu, 6),
+            "rss_mb": round(rss_final, 1),
+            "rss_delta_mb": round(rss_final - rss_inicial, 1),
+            "rss_pico_mb": round(max(pico, rss_final), 1),
+        })
+        with _candado:
+            _tramos.append(registro)
+
+def tramos():
+    with _candado:
+        return list(_tramos)
+
+# =======================================
+# EJECUCIÓN
+# =======================================
+def iniciar(script, ruta=RUTA_METRICAS, perfilado=PERFILADO, **extra):
+    # Llamar al principio del script; el registro se escribe al salir
+    # (también tras SystemExit o una excepción no capturada)
+    if _ejecucion:
+        return
+    _ejecucion.update({
+        "script": script, "ruta": ruta, "perfilado": perfilado, "extra": extra,
+        "inicio": datetime.now().isoformat(timespec="seconds"),
+        "perf": time.perf_counter(), "cpu": time.process_time(), "estado": "ok",
+    })
+    if perfilado == "cprofile":
+        import cProfile
+        _ejecucion["perfilador"] = cProfile.Profile()
+        _ejecucion["perfilador"].enable()
+    elif perfilado == "tf":
+        import tensorflow as tf
+        _ejecucion["logdir"] = os.path.join(DIRECTORIO_PERFILES, f"tf_{script}")
+        tf.profiler.experimental.start(_ejecucion["logdir"])
+
+    excepthook = sys.excepthook
+
+    def marcar_error(tipo, valor, traza):
+        _ejecucion["estado"] = "error"
+        _ejecucion["error"] = f"{tipo.__name__}: {valor}"
+        excepthook(tipo, valor, traza)
+
+    sys.excepthook = marcar_error
+    atexit.register(finalizar)
+
+def _cerrar_perfilado():
+    perfilador = _ejecucion.pop("perfilador", None)
+    if perfilador is not None:
+        import pstats
+
+        perfilador.disable()
+        os.makedirs(DIRECTORIO_PERFILES, exist_ok=True)
+        ruta = os.path.join(DIRECTORIO_PERFILES,
+                            f"{_ejecucion['script']}_{datetime.now():%Y%m%d_%H%M%S}.prof")
+        perfilador.dump_stats(ruta)
+        print(f"🔬 Perfil cProfile guardado en {ruta}")
+        pstats.Stats(perfilador).sort_stats("cumulative").print_stats(15)
+    elif _ejecucion.pop("logdir", None):
+        import tensorflow as tf
+        tf.profiler.experimental.stop()
+        print(f"🔬 Traza del profiler de TensorFlow en {DIRECTORIO_PERFILES}")
+
+def registro_ejecucion():
+    return {
+        "script": _ejecucion.get("script"),
+        "inicio": _ejecucion.get("inicio"),
+        "estado": _ejecucion.get("estado"),
+        "error": _ejecucion.get("error"),
+        "wall_s": round(time.perf_counter() - _ejecucion.get("perf", 0.0), 6),
+        "cpu_s": round(time.process_time() - _ejecucion.get("cpu", 0.0), 6),
+        "rss_pico_mb": round(rss_pico_mb(), 1),
+        "python": platform.python_version(),
+        "host": platform.node(),
+        **_ejecucion.get("extra", {}),
+        "tramos": tramos(),
+    }
+
+def finalizar():
+    if not _ejecucion or _ejecucion.get("finalizada"):
+        return None
+    _ejecucion["finalizada"] = True
+    _cerrar_perfilado()
+    registro = registro_ejecucion()
+
+    print(f"⏱️ {registro['script']}: {registro['wall_s']:.2f}s "
+          f"(CPU {registro['cpu_s']:.2f}s, pico {registro['rss_pico_mb']:.0f} MB)")
+    # Resumen por nombre (un tramo puede repetirse, p.ej. una descarga por año)
+    resumen = {}
+    for t in registro["tramos"]:
+        veces, wall, cpu, rss = resumen.get(t["tramo"], (0, 0.0, 0.0, 0.0))
+        resumen[t["tramo"]] = (veces + 1, wall + t["wall_s"], cpu + t["cpu_s"], max(rss, t["rss_mb"]))
+    for nombre, (veces, wall, cpu, rss) in resumen.items():
+        print(f"   {nombre:<32} x{veces:<3} {wall:>9.3f}s  CPU {cpu:>8.3f}s  RSS {rss:>7.1f} MB")
+    if _ejecucion["ruta"]:
+        with open(_ejecucion["ruta"], "a") as f:
+            f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    return registro
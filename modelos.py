@@ -0,0 +1,99 @@
+# =======================================
+# IMPORTS
+# =======================================
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras.models import Sequential, Model
+from tensorflow.keras.layers import (
+    LSTM, Dense, Dropout, Embedding, Input, LayerNormalization,
+    MultiHeadAttention, GlobalAveragePooling1D
+)
+
+# =======================================
+# CONFIG
+# =======================================
+RUTA_PESOS_LSTM = "weights_lstm.h5"
+RUTA_PESOS_TRANS = "weights_trans.h5"
+
+# =======================================
+# MODELOS
+# =======================================
+def crear_modelo_lstm(seq_length, num_classes=10, unroll=False):
+    model = Sequential([
+        Embedding(input_dim=num_classes, output_dim=32, input_length=seq_length),
+        LSTM(64, unroll=unroll),
+        Dense(num_classes, activation='softmax')
+    ])
+    model.compile(loss='sparse_categorical_crossentropy', optimizer='adam')
+    return model
+
+
+def crear_modelo_transformer(seq_length, num_classes=10, embed_dim=32, heads=2, ff_dim=64, dropout=0.1):
+    inputs = Input(shape=(seq_length,), dtype="int32")
+    x = Embedding(num_classes, embed_dim)(inputs)
+
+    attn = MultiHeadAttention(num_heads=heads, key_dim=embed_dim)(x, x)
+    attn = Dropout(dropout)(attn)
+    out1 = LayerNormalization(epsilon=1e-6)(x + attn)
+
+    ff = Dense(ff_dim, activation="relu")(out1)
+    ff = Dense(embed_dim)(ff)
+    ff = Dropout(dropout)(ff)
+    out2 = LayerNormalization(epsilon=1e-6)(out1 + ff)
+
+    x = GlobalAveragePooling1D()(out2)
+    outputs = Dense(num_classes, activation="softmax")(x)
+
+    model = Model(inputs, outputs)
+    model.compile(optimizer="adam", loss="sparse_categorical_crossentropy")
+    return model
+
+
+# =======================================
+# CARGA DE PESOS
+# =======================================
+def cargar_modelos(seq_length=10, ruta_lstm=RUTA_PESOS_LSTM, ruta_trans=RUTA_PESOS_TRANS):
+    modelo_lstm = crear_modelo_lstm(seq_length)
+    modelo_lstm.load_weights(ruta_lstm)
+
+    modelo_trans = crear_modelo_transformer(seq_length)
+    modelo_trans.load_weights(ruta_trans)
+    return modelo_lstm, modelo_trans
+
+
+# =======================================
+# ENSAMBLE FUSIONADO
+# =======================================
+def crear_modelo_ensamble(modelo_lstm, modelo_trans, seq_length=10):
+    # Una sola pasada devuelve las dos distribuciones (salidas "lstm" y "transformer")
+    inputs = Input(shape=(seq_length,), dtype="int32", name="secuencia")
+    p_lstm = tf.keras.layers.Activation("linear", name="lstm")(modelo_lstm(inputs))
+    p_trans = tf.keras.layers.Activation("linear", name="transformer")(modelo_trans(inputs))
+    return Model(inputs, [p_lstm, p_trans], name="ensamble")
+
+
+def crear_modelo_conjunto(modelo_lstm, modelo_trans, seq_length=10):
+    # Grafo de entrenamiento con ambas salidas: un solo fit ajusta los dos
+    # modelos con el mismo lote; los pesos quedan en modelo_lstm/modelo_trans
+    conjunto = crear_modelo_ensamble(modelo_lstm, modelo_trans, seq_length)
+    conjunto.compile(
+        optimizer="adam",
+        loss={"lstm": "sparse_categorical_crossentropy",
+              "transformer": "sparse_categorical_crossentropy"},
+    )
+    return conjunto
+
+
+def crear_predictor_ensamble(modelo_lstm, modelo_trans, seq_length=10):
+    # tf.function compilada: una pasada por lote, sin el coste fijo de predict()
+    ensamble = crear_modelo_ensamble(modelo_lstm, modelo_trans, seq_length)
+
+    @tf.function(input_signature=[tf.TensorSpec([None, seq_length], tf.int32)])
+    def _predecir(secuencias):
+        return ensamble(secuencias, training=False)
+
+    def predecir(entrada):
+        p_lstm, p_trans = _predecir(np.asarray(entrada, dtype=np.int32))
+        return p_lstm.numpy(), p_trans.numpy()
+
+    return predecir
@@ -0,0 +1,246 @@
+# =======================================
+# IMPORTS
+# =======================================
+import re
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser
+    except ImportError:
+        HTMLParser = None
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    lxml = None
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# =======================================
+# CONFIG
+# =======================================
+MESES = {
+    "ene.": "01", "feb.": "02", "mar.": "03", "abr.": "04",
+    "may.": "05", "jun.": "06", "jul.": "07", "ago.": "08",
+    "sep.": "09", "oct.": "10", "nov.": "11", "dic.": "12",
+}
+
+COLUMNAS = ["Fecha", "Turno", "Num1", "Num2", "Num3", "Último Número"]
+
+# Resultado columnar de una página de archivo:
+#   fechas     datetime64[D]  fecha real del sorteo
+#   turnos     uint8          código del turno, índice en `etiquetas`
+#   posiciones uint8          posición del sorteo en la fila (0 Día, 1 Tarde, 2 Noche)
+#   digitos    uint8 (n, 3)   los tres números del sorteo
+#   etiquetas  tuple[str]     texto del turno tal como aparece en la web
+Sorteos = namedtuple("Sorteos", ["fechas", "turnos", "posiciones", "digitos", "etiquetas"])
+
+_RE_TABLA = re.compile(
+    r"""<table\b[^>]*\bclass\s*=\s*(?:"[^"]*\barchives\b[^"]*"|'[^']*\barchives\b[^']*'|archives\b)""",
+    re.IGNORECASE,
+)
+_RE_ETIQUETA_TABLA = re.compile(r"<(/?)table\b", re.IGNORECASE)
+
+# =======================================
+# RECORTE DE LA TABLA
+# =======================================
+def recortar_tabla(html):
+    # Sólo interesa table.archives: se corta el fragmento antes de parsear
+    # para no construir el árbol de cabecera, menús y scripts de la página.
+    # Se cuentan las tablas anidadas para cortar en el </table> que la cierra.
+    m = _RE_TABLA.search(html)
+    if not m:
+        return None
+    profundidad = 1
+    for etiqueta in _RE_ETIQUETA_TABLA.finditer(html, m.end()):
+        profundidad += -1 if etiqueta.group(1) else 1
+        if profundidad == 0:
+            return html[m.start():html.index(">", etiqueta.end()) + 1]
+    return None
+
+# =======================================
+# BACKENDS
+# Cada backend recorre las filas y entrega (partes_fecha, [(etiqueta, [n1, n2, n3]), ...])
+# =======================================
+def _hijos_selectolax(nodo, etiqueta):
+    return [n for n in nodo.iter() if n.tag == etiqueta]
+
+def _filas_selectolax(fragmento):
+    arbol = HTMLParser(fragmento)
+    tabla = arbol.css_first("table.archives")
+    if tabla is None:
+        return
+    # Sólo filas propias (hijas de la tabla o de su tbody), no las de tablas anidadas
+    filas = []
+    for hijo in tabla.iter():
+        if hijo.tag == "tr":
+            filas.append(hijo)
+        elif hijo.tag == "tbody":
+            filas.extend(_hijos_selectolax(hijo, "tr"))
+    for fila in filas:
+        celdas = _hijos_selectolax(fila, "td")
+        if len(celdas) < 2:
+            continue
+        enlace = celdas[0].css_first("a")
+        if enlace is None:
+            continue
+        sorteos = []
+        for lista in celdas[1].css("ul.balls"):
+            primero = lista.css_first("li")
+            if primero is None:
+                continue
+            sorteos.append((
+                primero.text(strip=True),
+                [li.text(strip=True) for li in lista.css("li.ball")],
+            ))
+        yield enlace.text(separator=" ").split(), sorteos
+
+_CLASE_XPATH = "contains(concat(' ', normalize-space(@class), ' '), ' {} ')"
+
+if lxml is not None:
+    _XP_FILAS = etree.XPath("./tr | ./tbody/tr")
+    _XP_LISTAS = etree.XPath(f".//ul[{_CLASE_XPATH.format('balls')}]")
+    _XP_BOLAS = etree.XPath(f".//li[{_CLASE_XPATH.format('ball')}]")
+
+def _filas_lxml(fragmento):
+    tabla = lxml.html.fragment_fromstring(fragmento)
+    for fila in _XP_FILAS(tabla):
+        celdas = [c for c in fila if c.tag == "td"]
+        if len(celdas) < 2:
+            continue
+        enlace = next(celdas[0].iter("a"), None)
+        if enlace is None:
+            continue
+        sorteos = []
+        for lista in _XP_LISTAS(celdas[1]):
+            primero = next(lista.iter("li"), None)
+            if primero is None:
+                continue
+            sorteos.append((
+                primero.text_content().strip(),
+                ["".join(li.itertext()).strip() for li in _XP_BOLAS(lista)],
+            ))
+        yield " ".join(enlace.itertext()).split(), sorteos
+
+def _filas_bs4(fragmento):
+    sopa = BeautifulSoup(fragmento, "html.parser",
+                         parse_only=SoupStrainer("table", class_="archives"))
+    tabla = sopa.find("table", class_="archives")
+    if not tabla:
+        return
+    filas = []
+    for hijo in tabla.find_all(["tr", "tbody"], recursive=False):
+        filas.extend([hijo] if hijo.name == "tr" else hijo.find_all("tr", recursive=False))
+    for fila in filas:
+        celdas = fila.find_all("td", recursive=False)
+        if len(celdas) < 2:
+            continue
+        enlace = celdas[0].find("a")
+        if not enlace:
+            continue
+        sorteos = []
+        for lista in celdas[1].find_all("ul", class_="balls"):
+            primero = lista.find("li")
+            if primero is None:
+                continue
+            sorteos.append((
+                primero.text.strip(),
+                [li.text.strip() for li in lista.find_all("li", class_="ball")],
+            ))
+        yield enlace.get_text(separator=" ").split(), sorteos
+
+BACKENDS = {
+    "selectolax": _filas_selectolax,
+    "lxml": _filas_lxml,
+    "bs4": _filas_bs4,
+}
+
+def backends_disponibles():
+    disponibles = []
+    if HTMLParser is not None:
+        disponibles.append("selectolax")
+    if lxml is not None:
+        disponibles.append("lxml")
+    disponibles.append("bs4")
+    return disponibles
+
+def elegir_backend(backend="auto"):
+    if backend == "auto":
+        return backends_disponibles()[0]
+    if backend not in backends_disponibles():
+        raise ValueError(f"Backend de parseo no disponible: '{backend}'")
+    return backend
+
+# =======================================
+# PARSEO COLUMNAR
+# =======================================
+def _fecha_iso(partes):
+    # "Lunes 14 oct. 2024" -> "2024-10-14"
+    if len(partes) != 4:
+        return None
+    dia, mes, anio = partes[1:]
+    mes_num = MESES.get(mes)
+    if mes_num is None or not dia.isdigit() or not anio.isdigit():
+        return None
+    return f"{anio}-{mes_num}-{int(dia):02d}"
+
+def parsear_sorteos(html, backend="auto"):
+    backend = elegir_backend(backend)
+    fragmento = recortar_tabla(html)
+    if fragmento is None:
+        raise ValueError("No se encontró la tabla de resultados (table.archives) en la página")
+
+    fechas, turnos, posiciones, digitos = [], [], [], []
+    codigos = {}
+    for partes, sorteos in BACKENDS[backend](fragmento):
+        fecha = _fecha_iso(partes)
+        if fecha is None:
+            continue
+        for posicion, (etiqueta, numeros) in enumerate(sorteos):
+            if len(numeros) != 3 or not all(len(n) == 1 and "0" <= n <= "9" for n in numeros):
+                continue
+            fechas.append(fecha)
+            turnos.append(codigos.setdefault(etiqueta, len(codigos)))
+            posiciones.append(posicion)
+            digitos.append("".join(numeros))
+
+    # Los dígitos se convierten de una vez: "371" -> [3, 7, 1]
+    if digitos:
+        matriz = (np.frombuffer("".join(digitos).encode("ascii"), dtype=np.uint8)
+                  .reshape(-1, 3) - ord("0"))
+    else:
+        matriz = np.empty((0, 3), dtype=np.uint8)
+
+    return Sorteos(
+        fechas=np.array(fechas, dtype="datetime64[D]"),
+        turnos=np.array(turnos, dtype=np.uint8),
+        posiciones=np.array(posiciones, dtype=np.uint8),
+        digitos=matriz,
+        etiquetas=tuple(codigos),
+    )
+
+def sorteos_a_dataframe(sorteos):
+    etiquetas = np.array(sorteos.etiquetas, dtype=object)
+    return pd.DataFrame({
+        "Fecha": sorteos.fechas.astype("datetime64[ns]"),
+        "Turno": etiquetas[sorteos.turnos] if len(sorteos.turnos) else [],
+        "Num1": sorteos.digitos[:, 0].astype(np.int64),
+        "Num2": sorteos.digitos[:, 1].astype(np.int64),
+        "Num3": sorteos.digitos[:, 2].astype(np.int64),
+        "Último Número": sorteos.digitos[:, 2].astype(np.int64),
+    }, columns=COLUMNAS)
+
+def ultimo_sorteo(sorteos, posicion=0):
+    # Primer sorteo de la página (la más reciente) para el turno pedido
+    indices = np.flatnonzero(sorteos.posiciones == posicion)
+    if not len(indices):
+        raise ValueError("No se encontraron sorteos en la tabla")
+    i = indices[0]
+    fecha = pd.Timestamp(sorteos.fechas[i]).to_pydatetime()
+    return fecha, [int(n) for n in sorteos.digitos[i]]
@@ -0,0 +1,111 @@
+# =======================================
+# HISTÓRICO LOCAL DE PRECIOS MOVISTAR
+# Registro append-only de (timestamp, sku, precio) en SQLite. Sólo se
+# agrega una fila cuando un SKU aparece por primera vez o cambia de precio,
+# así el último precio de cada SKU es la foto anterior contra la que se
+# compara el scraping nuevo, sin leer Google Sheets. Los cambios que
+# superan el umbral quedan en alertas_pendientes en la misma transacción
+# y alertas_movistar.py los borra sólo después de enviarlos.
+# =======================================
+import os
+import sqlite3
+
+import pandas as pd
+
+RUTA_PRECIOS = os.environ.get("MOVISTAR_PRECIOS", "precios_movistar.sqlite")
+UMBRAL_ALERTA = 0.5
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS precios (
+    timestamp TEXT NOT NULL,
+    sku       TEXT NOT NULL,
+    precio    INTEGER,
+    producto  TEXT,
+    marca     TEXT,
+    PRIMARY KEY (sku, timestamp)
+);
+CREATE TABLE IF NOT EXISTS alertas_pendientes (
+    sku             TEXT PRIMARY KEY,
+    producto        TEXT,
+    precio_anterior INTEGER NOT NULL,
+    precio_nuevo    INTEGER NOT NULL,
+    diferencia      REAL NOT NULL
+);
+"""
+
+# =======================================
+# PARSEO Y COMPARACIÓN (VECTORIZADOS)
+# =======================================
+def parsear_precios(serie):
+    # "$199.990" -> 199990; sin dígitos -> NaN
+    digitos = serie.astype(str).str.replace(r"\D", "", regex=True)
+    return pd.to_numeric(digitos, errors="coerce").astype("Int64")
+
+def formatear_precio(precio):
+    return "$" + f"{int(precio):,}".replace(",", ".")
+
+def detectar_cambios(previos, actuales, umbral=UMBRAL_ALERTA):
+    # previos: sku, precio (foto anterior); actuales: sku, producto, precio
+    merged = actuales.merge(previos[["sku", "precio"]], on="sku", suffixes=("_nuevo", "_anterior"))
+    anterior = merged["precio_anterior"].astype("float64")
+    nuevo = merged["precio_nuevo"].astype("float64")
+    merged["diferencia"] = (nuevo - anterior).abs() / anterior
+    cambios = merged[(anterior > 0) & (merged["diferencia"] >= umbral)]
+    return cambios[["sku", "producto", "precio_anterior", "precio_nuevo", "diferencia"]] \
+        .reset_index(drop=True)
+
+# =======================================
+# ACCESO AL HISTÓRICO
+# =======================================
+def abrir_precios(ruta=RUTA_PRECIOS):
+    conn = sqlite3.connect(ruta)
+    conn.executescript(ESQUEMA)
+    return conn
+
+def ultimos_precios(conn):
+    # Último precio conocido de cada SKU (foto anterior). La tabla sólo crece,
+    # así que la última fila insertada es la más reciente; el timestamp es
+    # hora local de Chile y no ordena bien en el cambio de horario.
+    filas = conn.execute(
+        "SELECT timestamp, sku, precio, producto, marca FROM precios "
+        "WHERE rowid IN (SELECT MAX(rowid) FROM precios GROUP BY sku) ORDER BY rowid"
+    ).fetchall()
+    df = pd.DataFrame(filas, columns=["timestamp", "sku", "precio", "producto", "marca"])
+    df["precio"] = df["precio"].astype("Int64")
+    return df
+
+def guardar_precios(conn, df, timestamp, previos=None, cambios=None):
+    # df: columnas sku, precio (entero), producto, marca. Devuelve las filas nuevas.
+    # cambios (de detectar_cambios) se encolan como alertas pendientes; un
+    # cambio nuevo de un SKU reemplaza al que seguía sin enviar
+    previos = ultimos_precios(conn) if previos is None else previos
+    actuales = df.dropna(subset=["precio"]).drop_duplicates("sku")
+    merged = actuales.merge(previos[["sku", "precio"]], on="sku", how="left",
+                            suffixes=("", "_anterior"))
+    cambiado = (merged["precio"] != merged["precio_anterior"]).fillna(True)
+    nuevos = merged[merged["precio_anterior"].isna() | cambiado]
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO precios (timestamp, sku, precio, producto, marca) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(timestamp, sku, int(precio), producto, marca) for sku, precio, producto, marca in
+             zip(nuevos["sku"], nuevos["precio"], nuevos["producto"], nuevos["marca"])],
+        )
+        if cambios is not None and not cambios.empty:
+            conn.executemany(
+                "INSERT OR REPLACE INTO alertas_pendientes "
+                "(sku, producto, precio_anterior, precio_nuevo, diferencia) VALUES (?, ?, ?, ?, ?)",
+                [(sku, producto, int(anterior), int(nuevo), float(diferencia))
+                 for sku, producto, anterior, nuevo, diferencia in cambios.itertuples(index=False)],
+            )
+    return len(nuevos)
+
+def registrar_scraping(conn, df_latest, timestamp, umbral=UMBRAL_ALERTA):
+    # Compara el scraping con la foto anterior y lo agrega al histórico junto
+    # con las alertas pendientes. Devuelve (foto anterior, cambios que superan el umbral)
+    actuales = df_latest.assign(precio=parsear_precios(df_latest["precio_oferta"]))
+    previos = ultimos_precios(conn)
+    cambios = detectar_cambios(previos, actuales, umbral)
+    nuevos = guardar_precios(conn, actuales, timestamp, previos, cambios)
+    print(f"🗃️ Histórico de precios: {nuevos} fila(s) nuevas, {len(cambios)} cambio(s) ≥{umbral:.0%}")
+    return previos, cambios
@@ -0,0 +1,93 @@
+# =======================================
+# PREDICCIÓN POR LOTES
+# Puntúa muchas secuencias en una sola pasada del ensamble: cada turno,
+# varios horizontes (rollout autorregresivo) y puntos históricos.
+#   python prediccion.py --horizontes 3
+# =======================================
+import argparse
+import numpy as np
+import pandas as pd
+
+from preprocesamiento import serie_numeros, series_por_turno, ventanas
+
+MODELOS = ("lstm", "transformer")
+
+# =======================================
+# CONSULTAS
+# =======================================
+def consultas_por_turno(df, seq_length=10):
+    # Última ventana de la serie completa ("Todos") y de cada turno
+    etiquetas, secuencias = ["Todos"], [serie_numeros(df)[-seq_length:]]
+    for turno, numeros in series_por_turno(df).items():
+        if len(numeros) >= seq_length:
+            etiquetas.append(turno)
+            secuencias.append(numeros[-seq_length:])
+    return etiquetas, np.stack(secuencias)
+
+def consultas_backtest(numeros, seq_length=10, indices=None):
+    # Ventanas históricas (vistas sin copia) y el número que siguió a cada una
+    X, y = ventanas(numeros, seq_length)
+    if indices is not None:
+        X, y = X[indices], y[indices]
+    return X, y
+
+# =======================================
+# PREDICCIÓN
+# =======================================
+def predecir_rollout(predictor, secuencias, horizontes=1):
+    # predictor: callable(entrada) -> (p_lstm, p_trans), p.ej. el de
+    # crear_predictor_ensamble o PredictorTFLite.predecir.
+    # Devuelve probs de forma (n, horizontes, len(MODELOS), num_classes). Para
+    # h > 1 la ventana avanza con la clase más probable del ensamble.
+    ventana = np.array(secuencias, dtype=np.int32, ndmin=2)
+    probs = None
+    for h in range(horizontes):
+        p_lstm, p_trans = predictor(ventana)
+        if probs is None:
+            probs = np.empty((len(ventana), horizontes, len(MODELOS), p_lstm.shape[1]),
+                             dtype=np.float32)
+        probs[:, h, 0] = p_lstm
+        probs[:, h, 1] = p_trans
+        siguiente = np.argmax(probs[:, h].mean(axis=1), axis=1)
+        ventana = np.concatenate([ventana[:, 1:], siguiente[:, np.newaxis]], axis=1)
+    return probs
+
+def tabla_probabilidades(probs, etiquetas=None):
+    # Formato largo: una fila por (consulta, horizonte, modelo, número)
+    n, horizontes, _, num_classes = probs.shape
+    con_ensamble = np.concatenate([probs, probs.mean(axis=2, keepdims=True)], axis=2)
+    modelos = MODELOS + ("ensamble",)
+    etiquetas = np.asarray(etiquetas if etiquetas is not None else np.arange(n))
+
+    forma = con_ensamble.shape
+    indices = np.indices(forma).reshape(len(forma), -1)
+    return pd.DataFrame({
+        "consulta": etiquetas[indices[0]],
+        "horizonte": indices[1] + 1,
+        "modelo": np.asarray(modelos)[indices[2]],
+        "numero": indices[3],
+        "prob": con_ensamble.reshape(-1),
+    })
+
+# =======================================
+# MAIN
+# =======================================
+if __name__ == "__main__":
+    from historial import actualizar_historial
+    from modelos import cargar_modelos, crear_predictor_ensamble
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--horizontes", type=int, default=1)
+    parser.add_argument("--seq-length", type=int, default=10)
+    args = parser.parse_args()
+
+    resultados = actualizar_historial(num_anios=10)
+    etiquetas, secuencias = consultas_por_turno(resultados, args.seq_length)
+
+    predictor = crear_predictor_ensamble(*cargar_modelos(args.seq_length), args.seq_length)
+    probs = predecir_rollout(predictor, secuencias, args.horizontes)
+
+    tabla = tabla_probabilidades(probs, etiquetas)
+    ensamble = tabla[tabla["modelo"] == "ensamble"]
+    mejores = ensamble.loc[ensamble.groupby(["consulta", "horizonte"])["prob"].idxmax()]
+    print(mejores.to_string(index=False))
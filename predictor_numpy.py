@@ -0,0 +1,131 @@
+# =======================================
+# PREDICTOR NUMPY (SIN TENSORFLOW)
+# Lee los pesos de weights_lstm.h5 / weights_trans.h5 con h5py y reproduce
+# la pasada hacia adelante de crear_modelo_lstm y crear_modelo_transformer,
+# vectorizada sobre el lote.
+#   python predictor_numpy.py --verificar   (compara contra Keras)
+# =======================================
+import importlib.util
+import os
+
+import numpy as np
+
+RUTA_PESOS_LSTM = "weights_lstm.h5"
+RUTA_PESOS_TRANS = "weights_trans.h5"
+
+# =======================================
+# LECTURA DE PESOS
+# =======================================
+def leer_pesos_h5(ruta):
+    # Igual que Keras al cargar un .h5: capas en el orden de layer_names y,
+    # dentro de cada una, pesos en el orden de weight_names. Las capas sin
+    # pesos (Input, suma, pooling) se omiten.
+    import h5py
+
+    capas = []
+    with h5py.File(ruta, "r") as f:
+        for nombre in f.attrs["layer_names"]:
+            grupo = f[nombre]
+            pesos = [np.asarray(grupo[n], dtype=np.float32) for n in grupo.attrs["weight_names"]]
+            if pesos:
+                capas.append(pesos)
+    return capas
+
+# =======================================
+# CAPAS
+# =======================================
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+def _softmax(x, axis=-1):
+    e = np.exp(x - x.max(axis=axis, keepdims=True))
+    return e / e.sum(axis=axis, keepdims=True)
+
+def _layer_norm(x, gamma, beta, epsilon=1e-6):
+    media = x.mean(axis=-1, keepdims=True)
+    varianza = x.var(axis=-1, keepdims=True)
+    return (x - media) / np.sqrt(varianza + epsilon) * gamma + beta
+
+def forward_lstm(capas, entrada):
+    # Embedding -> LSTM(64) -> Dense softmax. Compuertas de Keras: i, f, c, o
+    (embeddings,), (kernel, recurrente, bias), (w_salida, b_salida) = capas
+    x = embeddings[entrada]
+    unidades = recurrente.shape[0]
+    # Proyección de la entrada de todos los pasos en una sola multiplicación
+    proyeccion = x @ kernel + bias
+    h = np.zeros((len(entrada), unidades), dtype=np.float32)
+    c = np.zeros_like(h)
+    for t in range(entrada.shape[1]):
+        z = proyeccion[:, t] + h @ recurrente
+        i = _sigmoid(z[:, :unidades])
+        f = _sigmoid(z[:, unidades:2 * unidades])
+        g = np.tanh(z[:, 2 * unidades:3 * unidades])
+        o = _sigmoid(z[:, 3 * unidades:])
+        c = f * c + i * g
+        h = o * np.tanh(c)
+    return _softmax(h @ w_salida + b_salida)
+
+def forward_transformer(capas, entrada):
+    # Embedding -> MultiHeadAttention + LayerNorm -> FF + LayerNorm -> media -> Dense
+    ((embeddings,), (wq, bq, wk, bk, wv, bv, wo, bo), (g1, b1),
+     (w_ff1, b_ff1), (w_ff2, b_ff2), (g2, b2), (w_salida, b_salida)) = capas
+    x = embeddings[entrada]
+    key_dim = wq.shape[-1]
+
+    q = (np.einsum("bsd,dhk->bshk", x, wq) + bq) / np.sqrt(np.float32(key_dim))
+    k = np.einsum("bsd,dhk->bshk", x, wk) + bk
+    v = np.einsum("bsd,dhk->bshk", x, wv) + bv
+    atencion = _softmax(np.einsum("bqhk,bshk->bhqs", q, k))
+    contexto = np.einsum("bhqs,bshk->bqhk", atencion, v)
+    attn = np.einsum("bqhk,hkd->bqd", contexto, wo) + bo
+    out1 = _layer_norm(x + attn, g1, b1)
+
+    ff = np.maximum(out1 @ w_ff1 + b_ff1, 0.0) @ w_ff2 + b_ff2
+    out2 = _layer_norm(out1 + ff, g2, b2)
+    return _softmax(out2.mean(axis=1) @ w_salida + b_salida)
+
+# =======================================
+# PREDICTOR
+# =======================================
+class PredictorNumPy:
+    def __init__(self, ruta_lstm=RUTA_PESOS_LSTM, ruta_trans=RUTA_PESOS_TRANS):
+        self.capas_lstm = leer_pesos_h5(ruta_lstm)
+        self.capas_trans = leer_pesos_h5(ruta_trans)
+
+    def predecir(self, entrada):
+        entrada = np.atleast_2d(np.asarray(entrada, dtype=np.int64))
+        return (forward_lstm(self.capas_lstm, entrada).astype(np.float32),
+                forward_transformer(self.capas_trans, entrada).astype(np.float32))
+
+def disponible(rutas=(RUTA_PESOS_LSTM, RUTA_PESOS_TRANS)):
+    return importlib.util.find_spec("h5py") is not None and all(os.path.exists(r) for r in rutas)
+
+# =======================================
+# MAIN (VERIFICACIÓN CONTRA KERAS)
+# =======================================
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--verificar", action="store_true")
+    parser.add_argument("--consultas", type=int, default=500)
+    parser.add_argument("--seq-length", type=int, default=10)
+    parser.add_argument("--tolerancia", type=float, default=1e-5)
+    args = parser.parse_args()
+
+    entradas = np.random.default_rng(0).integers(0, 10, size=(args.consultas, args.seq_length))
+    p_lstm, p_trans = PredictorNumPy().predecir(entradas)
+    print(f"🔢 {len(entradas)} consultas evaluadas con NumPy")
+
+    if args.verificar:
+        from modelos import cargar_modelos, crear_predictor_ensamble
+
+        referencia = crear_predictor_ensamble(*cargar_modelos(args.seq_length), args.seq_length)(entradas)
+        dif_lstm = float(np.abs(p_lstm - referencia[0]).max())
+        dif_trans = float(np.abs(p_trans - referencia[1]).max())
+        print(f"📏 Diferencia máxima con Keras: LSTM {dif_lstm:.2e}, Transformer {dif_trans:.2e}")
+        if max(dif_lstm, dif_trans) > args.tolerancia:
+            print(f"❌ Fuera de tolerancia ({args.tolerancia:g})")
+            sys.exit(1)
+        print("✅ Pasada NumPy equivalente a Keras")
@@ -0,0 +1,50 @@
+# =======================================
+# PREDICTOR LIGERO (TFLITE)
+# =======================================
+import os
+import numpy as np
+
+try:
+    from tflite_runtime.interpreter import Interpreter
+except ImportError:
+    Interpreter = None
+
+RUTA_TFLITE = "modelo_ensamble.tflite"
+# float32: artefacto base; float16/int8: pesos cuantizados tras el entrenamiento
+MODOS = ("float32", "float16", "int8")
+
+def ruta_artefacto(modo="float32", ruta=RUTA_TFLITE):
+    if modo == "float32":
+        return ruta
+    base, extension = os.path.splitext(ruta)
+    return f"{base}_{modo}{extension}"
+
+def _interprete(ruta):
+    if Interpreter is not None:
+        return Interpreter(model_path=ruta)
+    # Sin tflite_runtime se usa el intérprete incluido en TensorFlow
+    import tensorflow as tf
+    return tf.lite.Interpreter(model_path=ruta)
+
+def artefacto_vigente(ruta=RUTA_TFLITE, rutas_pesos=("weights_lstm.h5", "weights_trans.h5")):
+    # El artefacto sólo sirve si es posterior a los pesos de los que se exportó
+    if not os.path.exists(ruta):
+        return False
+    mtime = os.path.getmtime(ruta)
+    return all(not os.path.exists(p) or os.path.getmtime(p) <= mtime for p in rutas_pesos)
+
+class PredictorTFLite:
+    def __init__(self, ruta=RUTA_TFLITE):
+        self.interprete = _interprete(ruta)
+        self.firma = self.interprete.get_signature_runner()
+        self.nombre_entrada = next(iter(self.firma.get_input_details()))
+
+    def predecir(self, entrada):
+        # El grafo exportado tiene lote fijo de 1: cada fila es una invocación
+        entrada = np.atleast_2d(np.asarray(entrada, dtype=np.int32))
+        p_lstm, p_trans = [], []
+        for fila in entrada:
+            salidas = self.firma(**{self.nombre_entrada: fila[np.newaxis, :]})
+            p_lstm.append(salidas["lstm"][0])
+            p_trans.append(salidas["transformer"][0])
+        return np.stack(p_lstm), np.stack(p_trans)
@@ -0,0 +1,81 @@
+# =======================================
+# IMPORTS
+# =======================================
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# =======================================
+# SERIES DE NÚMEROS
+# =======================================
+def serie_numeros(df, columna="Último Número", dtype=np.uint8):
+    # Orden estable: dentro de una misma fecha se respeta Día/Tarde/Noche
+    df = df.sort_values("Fecha", kind="stable")
+    return df[columna].to_numpy(dtype=dtype)
+
+def series_por_turno(df, columna="Último Número", dtype=np.uint8):
+    df = df.sort_values("Fecha", kind="stable")
+    return {
+        turno: grupo[columna].to_numpy(dtype=dtype)
+        for turno, grupo in df.groupby("Turno", sort=False)
+    }
+
+# =======================================
+# VENTANAS DESLIZANTES
+# =======================================
+def ventanas(numeros, seq_length=10):
+    # X es una vista (sin copia) de forma (n - seq_length, seq_length) sobre
+    # `numeros`; y es la vista del número siguiente a cada ventana.
+    numeros = np.asarray(numeros)
+    if len(numeros) <= seq_length:
+        return (np.empty((0, seq_length), dtype=numeros.dtype),
+                np.empty((0,), dtype=numeros.dtype))
+    X = sliding_window_view(numeros[:-1], seq_length)
+    y = numeros[seq_length:]
+    return X, y
+
+def ventanas_multiples(numeros, seq_lengths):
+    return {seq_length: ventanas(numeros, seq_length) for seq_length in seq_lengths}
+
+def ventanas_por_turno(df, seq_length=10, columna="Último Número", dtype=np.uint8):
+    return {
+        turno: ventanas(numeros, seq_length)
+        for turno, numeros in series_por_turno(df, columna, dtype).items()
+    }
+
+def ultima_ventana(numeros, seq_length=10):
+    return np.asarray(numeros)[-seq_length:][np.newaxis, :]
+
+def preparar_datos_lstm(df, seq_length=10, dtype=np.uint8):
+    return ventanas(serie_numeros(df, dtype=dtype), seq_length)
+
+# =======================================
+# TF.DATA
+# =======================================
+def ventanas_dataset(numeros, seq_length=10, batch_size=32, shuffle=False, seed=None):
+    # Las ventanas se generan dentro del pipeline, sin materializar X en memoria
+    import tensorflow as tf
+
+    numeros = np.asarray(numeros)
+    return tf.keras.utils.timeseries_dataset_from_array(
+        numeros[:-1],
+        targets=numeros[seq_length:],
+        sequence_length=seq_length,
+        batch_size=batch_size,
+        shuffle=shuffle,
+        seed=seed,
+    ).prefetch(tf.data.AUTOTUNE)
+
+def dataset_entrenamiento(X, y, batch_size=32, salidas=None, shuffle=True, seed=None):
+    # Etiquetas enteras (sparse), sin copia one-hot. Con `salidas` el mismo
+    # objetivo alimenta cada salida de un modelo multi-salida.
+    import tensorflow as tf
+
+    ds = tf.data.Dataset.from_tensor_slices((np.asarray(X), np.asarray(y)))
+    ds = ds.map(lambda x, t: (tf.cast(x, tf.int32), tf.cast(t, tf.int32)),
+                num_parallel_calls=tf.data.AUTOTUNE)
+    if salidas:
+        ds = ds.map(lambda x, t: (x, {nombre: t for nombre in salidas}))
+    ds = ds.cache()
+    if shuffle:
+        ds = ds.shuffle(len(y), seed=seed, reshuffle_each_iteration=True)
+    return ds.batch(batch_size).prefetch(tf.data.AUTOTUNE)
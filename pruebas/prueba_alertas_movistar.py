@@ -0,0 +1,126 @@
+# =======================================
+# PRUEBA DE ALERTAS MOVISTAR CONTRA UN SMTP LOCAL
+# Levanta un servidor aiosmtpd en localhost y recorre el ciclo completo:
+# cambios detectados -> alertas pendientes -> SMTP caído (siguen pendientes)
+# -> envío -> deduplicación, más un resumen partido en varios mensajes con
+# un fallo a mitad de envío. Sin red ni credenciales.
+#   pip install aiosmtpd
+#   python pruebas/prueba_alertas_movistar.py
+# =======================================
+import email
+import os
+import socket
+import sys
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+try:
+    from aiosmtpd.controller import Controller
+except ImportError:
+    raise SystemExit("⚠️ Falta aiosmtpd: pip install aiosmtpd")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from alertas_movistar import MAX_POR_MENSAJE, enviar_alertas, leer_pendientes
+from precios_movistar import abrir_precios, registrar_scraping
+
+class Buzon:
+    # Guarda los mensajes recibidos; rechaza con 451 los números de mensaje en `fallar`
+    def __init__(self):
+        self.mensajes = []
+        self.fallar = set()
+        self.recibidos = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.recibidos += 1
+        if self.recibidos in self.fallar:
+            return "451 Fallo temporal de prueba"
+        mensaje = email.message_from_bytes(envelope.content)
+        self.mensajes.append(mensaje.get_payload(decode=True).decode("utf-8"))
+        return "250 OK"
+
+def puerto_libre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def catalogo(precios):
+    return pd.DataFrame({
+        "sku": [f"SKU{i}" for i in range(len(precios))],
+        "producto": [f"Equipo {i}" for i in range(len(precios))],
+        "precio_oferta": [f"${p:,}".replace(",", ".") for p in precios],
+        "marca": "Marca",
+    })
+
+def config(puerto):
+    return {"host": "127.0.0.1", "puerto": puerto, "ssl": False, "usuario": None,
+            "password": None, "remitente": "bot@localhost", "destino": "alertas@localhost"}
+
+def pendientes(conn):
+    return sorted(leer_pendientes(conn)["sku"])
+
+def probar_ciclo(buzon, puerto):
+    conn = abrir_precios(":memory:")
+    ahora = datetime(2024, 1, 1, 12, 0)
+    registrar_scraping(conn, catalogo([100_000, 200_000, 300_000]), "2024-01-01 08:45:00")
+    registrar_scraping(conn, catalogo([40_000, 200_000, 600_000]), "2024-01-01 09:00:00")
+    assert pendientes(conn) == ["SKU0", "SKU2"], pendientes(conn)
+
+    # SMTP caído: el error sube y las alertas no se pierden
+    try:
+        enviar_alertas(conn, config(puerto_libre()), ahora)
+    except OSError:
+        pass
+    else:
+        raise AssertionError("se esperaba un error de conexión")
+    assert pendientes(conn) == ["SKU0", "SKU2"]
+
+    # SMTP de vuelta: un solo resumen con los dos cambios
+    assert enviar_alertas(conn, config(puerto), ahora) == 2
+    assert len(buzon.mensajes) == 1 and "SKU0" in buzon.mensajes[0] and "SKU2" in buzon.mensajes[0]
+    assert pendientes(conn) == []
+
+    # El mismo SKU y precio vuelve a detectarse: se descarta sin enviar
+    registrar_scraping(conn, catalogo([100_000, 200_000, 600_000]), "2024-01-01 09:15:00")
+    registrar_scraping(conn, catalogo([40_000, 200_000, 600_000]), "2024-01-01 09:30:00")
+    assert pendientes(conn) == ["SKU0"]
+    assert enviar_alertas(conn, config(puerto), ahora + timedelta(hours=2)) == 0
+    assert len(buzon.mensajes) == 1 and pendientes(conn) == []
+    print("✅ Ciclo pendiente → fallo SMTP → envío → deduplicación")
+
+def probar_fallo_parcial(buzon, puerto):
+    conn = abrir_precios(":memory:")
+    ahora = datetime(2024, 1, 1, 12, 0)
+    n = MAX_POR_MENSAJE * 2 + 10
+    registrar_scraping(conn, catalogo([100_000] * n), "2024-01-01 08:45:00")
+    registrar_scraping(conn, catalogo([300_000] * n), "2024-01-01 09:00:00")
+    assert len(pendientes(conn)) == n
+
+    # Se rechaza el segundo mensaje: el primero queda registrado, el resto pendiente
+    buzon.mensajes.clear()
+    buzon.recibidos = 0
+    buzon.fallar = {2}
+    try:
+        enviar_alertas(conn, config(puerto), ahora)
+    except Exception:
+        pass
+    else:
+        raise AssertionError("se esperaba el rechazo del segundo mensaje")
+    assert len(buzon.mensajes) == 1
+    assert len(pendientes(conn)) == n - MAX_POR_MENSAJE
+
+    buzon.fallar = set()
+    assert enviar_alertas(conn, config(puerto), ahora) == n - MAX_POR_MENSAJE
+    assert len(buzon.mensajes) == 3 and pendientes(conn) == []
+    print(f"✅ Resumen de {n} cambios en 3 mensajes con un rechazo a mitad de envío")
+
+if __name__ == "__main__":
+    buzon = Buzon()
+    puerto = puerto_libre()
+    controlador = Controller(buzon, hostname="127.0.0.1", port=puerto)
+    controlador.start()
+    try:
+        probar_ciclo(buzon, puerto)
+        probar_fallo_parcial(buzon, puerto)
+    finally:
+        controlador.stop()
@@ -0,0 +1,40 @@
+# =======================================
+# PRUEBAS DEL CÓDIGO DE SALIDA DE loto3.main
+#   python -m pytest pruebas
+# =======================================
+import os
+import sys
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import loto3
+from hoja_falsa import HojaFalsa, LibroFalso
+from sumidero_sheets import SumideroSheets
+
+@pytest.fixture
+def libro(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(loto3.metricas, "iniciar", lambda *a, **k: None)
+    libro = LibroFalso({h: HojaFalsa(h) for _, h in loto3.TURNOS.values()}, fallos=[503] * 20)
+    sumidero = SumideroSheets(libro.worksheet, ruta=str(tmp_path / "spool.sqlite"),
+                              abrir_libro=lambda: libro, dormir=lambda s: None)
+    monkeypatch.setattr(loto3, "sumidero", lambda: sumidero)
+    monkeypatch.setattr(loto3.cliente_google, "hoja", lambda _, nombre: libro.worksheet(nombre))
+    return libro
+
+def test_fallo_de_scraping_se_propaga(libro, monkeypatch):
+    def caida(turnos):
+        raise ConnectionError("sin red")
+    monkeypatch.setattr(loto3, "obtener_ultimos_sorteos", caida)
+    with pytest.raises(ConnectionError):
+        loto3.main([])
+
+def test_fallo_de_sheets_no_aborta(libro, monkeypatch):
+    monkeypatch.setattr(loto3, "obtener_ultimos_sorteos",
+                        lambda turnos: {t: (date(2024, 1, 1), [3, 7, 1]) for t in turnos})
+    loto3.main([])
+    # batch_update falla en todos los reintentos: encabezado y sorteo quedan en el spool
+    assert libro.llamadas and all(h.filas == [] for h in libro.hojas.values())
+    assert loto3.sumidero().pendientes() == 6
@@ -0,0 +1,67 @@
+# =======================================
+# PRUEBAS DE LOS BACKENDS DE PARSEO (MISMA ENTRADA, MISMO RESULTADO)
+#   python -m pytest pruebas
+# =======================================
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from parseo import backends_disponibles, parsear_sorteos
+
+def fila(fecha, sorteos, extra=""):
+    listas = "".join(
+        f'<ul class="balls"><li class="draw-name">{turno}</li>'
+        + "".join(f'<li class="ball">{n}</li>' for n in numeros) + "</ul>"
+        for turno, numeros in sorteos
+    )
+    return f'<tr><td><a href="/r"><span class="day">Lunes</span> {fecha}</a>{extra}</td><td>{listas}</td></tr>'
+
+FILAS = (
+    fila("14 oct. 2024", [("Día", "371"), ("Tarde", "052"), ("Noche", "999")])
+    + fila("13 oct. 2024", [("Día", "100"), ("Tarde", "234")])
+)
+# Tabla anidada dentro de una celda con filas que parecen sorteos
+ANIDADA = fila("12 oct. 2024", [("Día", "888")],
+               extra='<table><tbody>' + fila("1 ene. 2000", [("Día", "555")]) + "</tbody></table>")
+
+CABECERA = "<thead><tr><th>Fecha</th><th>Resultados</th></tr></thead>"
+PAGINAS = {
+    "con_tbody": f'<main><table class="archives">{CABECERA}<tbody>{FILAS}</tbody></table></main>',
+    "sin_tbody": f'<main><table class="archives">{FILAS}</table></main>',
+    "anidada": f'<main><table class="archives"><tbody>{FILAS}{ANIDADA}</tbody></table></main>',
+}
+ESPERADO = {
+    "con_tbody": (["2024-10-14"] * 3 + ["2024-10-13"] * 2, ["371", "052", "999", "100", "234"]),
+    "sin_tbody": (["2024-10-14"] * 3 + ["2024-10-13"] * 2, ["371", "052", "999", "100", "234"]),
+    "anidada": (["2024-10-14"] * 3 + ["2024-10-13"] * 2 + ["2024-10-12"],
+                ["371", "052", "999", "100", "234", "888"]),
+}
+
+@pytest.mark.parametrize("backend", backends_disponibles())
+@pytest.mark.parametrize("caso", sorted(PAGINAS))
+def test_backends_coinciden(backend, caso):
+    sorteos = parsear_sorteos(PAGINAS[caso], backend=backend)
+    fechas, numeros = ESPERADO[caso]
+    assert sorteos.fechas.astype(str).tolist() == fechas
+    assert ["".join(map(str, d)) for d in sorteos.digitos] == numeros
+    assert sorteos.etiquetas == ("Día", "Tarde", "Noche")
+
+def test_sin_tabla_es_error():
+    with pytest.raises(ValueError):
+        parsear_sorteos("<main><p>Mantenimiento</p></main>")
+
+def test_fixture_igual_en_todos_los_backends():
+    ruta = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "benchmarks", "fixtures", "loto3_2024.html")
+    if not os.path.exists(ruta):
+        pytest.skip("falta el fixture; generar con benchmarks/generar_fixtures.py")
+    with open(ruta, encoding="utf-8") as f:
+        html = f.read()
+    resultados = [parsear_sorteos(html, backend=b) for b in backends_disponibles()]
+    for otro in resultados[1:]:
+        np.testing.assert_array_equal(otro.fechas, resultados[0].fechas)
+        np.testing.assert_array_equal(otro.digitos, resultados[0].digitos)
+        assert otro.etiquetas == resultados[0].etiquetas
@@ -0,0 +1,69 @@
+# =======================================
+# PRUEBAS DEL SERVIDOR DE PREDICCIÓN CON UN CACHÉ FALSO (SIN TENSORFLOW)
+#   python -m pytest pruebas
+# =======================================
+import json
+import os
+import sys
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from servidor_prediccion import consultar_servidor, crear_manejador
+
+class CacheFalso:
+    seq_length = 5
+    hashes = ("falso", "falso")
+
+    def predecir(self, secuencias):
+        entrada = np.asarray(secuencias, dtype=np.int32).reshape(-1, self.seq_length)
+        probs = np.full((len(entrada), 10), 0.05)
+        probs[:, 3] = 0.55
+        return probs, probs
+
+@pytest.fixture(scope="module")
+def url():
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), crear_manejador(CacheFalso()))
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    yield f"http://127.0.0.1:{servidor.server_address[1]}"
+    servidor.shutdown()
+    servidor.server_close()
+
+def enviar(url, consulta):
+    peticion = urllib.request.Request(url + "/predecir", data=json.dumps(consulta).encode("utf-8"),
+                                      headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(peticion, timeout=5) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+def test_prediccion_valida(url):
+    respuesta = consultar_servidor(url, [1, 2, 3, 4, 5], num_simulaciones=100)
+    assert respuesta["ensamble"]["clase"] == 3
+    assert sum(respuesta["monte_carlo"]) == 100
+
+@pytest.mark.parametrize("consulta", [
+    {"secuencia": [1, 2, 3]},
+    {"secuencia": [1, 2, 3, 4, 5, 6]},
+    {"secuencia": [1, 2, 3, 4, 10]},
+    {"secuencia": [1, 2, 3, 4, -1]},
+    {"secuencia": [1, 2, 3, 4, "5"]},
+    {"secuencia": [1, 2, 3, 4, 2.5]},
+    {"secuencia": "12345"},
+    {"secuencia": [1, 2, 3, 4, 5], "simulaciones": -1},
+    {"secuencia": [1, 2, 3, 4, 5], "simulaciones": [1]},
+    {},
+    [1, 2, 3, 4, 5],
+])
+def test_consulta_invalida_es_400(url, consulta):
+    codigo, cuerpo = enviar(url, consulta)
+    assert codigo == 400 and "error" in cuerpo
+    # El servidor sigue atendiendo después del error
+    assert enviar(url, {"secuencia": [0, 0, 0, 0, 0]})[0] == 200
@@ -0,0 +1,109 @@
+# =======================================
+# PRUEBAS DEL SPOOL DE GOOGLE SHEETS CONTRA LA HOJA FALSA
+#   python -m pytest pruebas
+# =======================================
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from hoja_falsa import ErrorAPIFalso, HojaFalsa, LibroFalso
+from sumidero_sheets import SumideroSheets, con_reintentos, segundos_retry_after
+
+FILA = ["2024-01-01 14:15:00", 3, 7, 1, "2024-01-01"]
+
+@pytest.fixture
+def ruta(tmp_path):
+    return str(tmp_path / "spool.sqlite")
+
+def sumidero_de(hoja, ruta, **kwargs):
+    esperas = []
+    sumidero = SumideroSheets(lambda nombre: hoja, ruta=ruta, dormir=esperas.append, **kwargs)
+    return sumidero, esperas
+
+def test_misma_clave_no_duplica(ruta):
+    hoja = HojaFalsa("results")
+    sumidero, _ = sumidero_de(hoja, ruta)
+    assert sumidero.encolar("results", FILA, "results|2024-01-01") == 1
+    assert sumidero.encolar("results", FILA, "results|2024-01-01") == 0
+    sumidero.vaciar()
+    # Ya enviada: volver a encolarla no la reenvía
+    assert sumidero.encolar("results", FILA, "results|2024-01-01") == 0
+    assert sumidero.vaciar() == {}
+    assert len(hoja.filas) == 1 and hoja.llamadas == ["append_rows"]
+
+def test_429_y_luego_exito_envia_una_vez(ruta):
+    hoja = HojaFalsa("results", fallos=[429])
+    sumidero, esperas = sumidero_de(hoja, ruta)
+    sumidero.encolar_varias("results", [FILA, ["2024-01-02 14:15:00", 1, 2, 3, "2024-01-02"]])
+    assert sumidero.vaciar() == {"results": 2}
+    assert hoja.llamadas == ["append_rows", "append_rows"]
+    assert len(hoja.filas) == 2 and len(esperas) == 1
+    assert sumidero.pendientes() == 0
+
+def test_vaciar_fallido_deja_pendientes(ruta):
+    hoja = HojaFalsa("results", fallos=[503] * 3)
+    sumidero, esperas = sumidero_de(hoja, ruta, max_intentos=3)
+    sumidero.encolar("results", FILA)
+    with pytest.raises(ErrorAPIFalso):
+        sumidero.vaciar()
+    assert hoja.filas == [] and len(esperas) == 2
+    assert sumidero.pendientes("results") == 1
+    assert sumidero.intentar_vaciar() == {"results": 1}
+    assert sumidero.pendientes() == 0
+
+@pytest.mark.parametrize("llego", [True, False])
+def test_recuperar_lote_a_medio_enviar(ruta, llego):
+    # Corte entre append_rows y el registro local: el lote queda marcado
+    hoja = HojaFalsa("results", filas=[["FechaHora", "Num1", "Num2", "Num3", "FechaSorteo"]])
+    filas = [["007", 3, 7, 1, "2024-01-01"], ["2024-01-02 14:15:00", 1, 2, 3, "2024-01-02"]]
+    sumidero, _ = sumidero_de(hoja, ruta)
+    sumidero.encolar_varias("results", filas)
+    claves = [c for (c,) in sumidero.conn.execute("SELECT clave FROM pendientes ORDER BY rowid")]
+    sumidero._marcar_lote(claves)
+    if llego:
+        # USER_ENTERED: la hoja muestra "7", no "007"
+        hoja.append_rows(filas, value_input_option="USER_ENTERED")
+    sumidero.cerrar()
+
+    sumidero, _ = sumidero_de(hoja, ruta)
+    hoja.llamadas.clear()
+    sumidero.vaciar()
+    assert len(hoja.filas) == 3 and sumidero.pendientes() == 0
+    assert ("append_rows" in hoja.llamadas) is not llego
+
+def test_varias_hojas_en_un_batch_update(ruta):
+    nombres = ("loto3_dia", "loto3_tarde", "loto3_noche")
+    libro = LibroFalso({h: HojaFalsa(h) for h in nombres})
+    sumidero = SumideroSheets(libro.worksheet, ruta=ruta, abrir_libro=lambda: libro,
+                              dormir=lambda s: None)
+    for i, nombre in enumerate(nombres):
+        sumidero.encolar(nombre, [FILA[0], i, i, i, FILA[4]], f"{nombre}|2024-01-01")
+    assert sumidero.vaciar() == {h: 1 for h in nombres}
+    assert libro.llamadas == ["batch_update"]
+    for i, nombre in enumerate(nombres):
+        assert libro.hojas[nombre].filas == [[FILA[0], str(i), str(i), str(i), FILA[4]]]
+        assert libro.hojas[nombre].llamadas == []
+    assert sumidero.pendientes() == 0
+
+def test_retry_after_con_fecha_http():
+    ahora = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+    assert segundos_retry_after("30") == 30
+    assert segundos_retry_after(format_datetime(ahora + timedelta(seconds=20), usegmt=True),
+                                ahora) == 20
+    assert segundos_retry_after("pronto") is None
+
+    esperas = []
+    fallos = [ErrorAPIFalso(429, {"Retry-After": "Wed, 21 Oct 2099 07:28:00 GMT"}),
+              ErrorAPIFalso(429, {"Retry-After": "no-es-fecha"})]
+
+    def llamada():
+        if fallos:
+            raise fallos.pop(0)
+        return "ok"
+    assert con_reintentos(llamada, espera_base=1.0, espera_max=10.0, dormir=esperas.append) == "ok"
+    # Fecha lejana: se limita a espera_max; ilegible: espera exponencial
+    assert esperas[0] == 10.0 and 2.0 <= esperas[1] <= 2.5
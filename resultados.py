@@ -0,0 +1,136 @@
+# =======================================
+# IMPORTS
+# =======================================
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import pandas as pd
+
+import metricas
+from parseo import COLUMNAS, parsear_sorteos, sorteos_a_dataframe
+
+# =======================================
+# CONFIG
+# =======================================
+URL_ANIO = "https://www.loterias.com/loto-3/resultados/{anio}"
+USER_AGENT = "Mozilla/5.0 (compatible; loto3-bot)"
+MAX_POR_HOST = 4
+
+# =======================================
+# SESIÓN HTTP COMPARTIDA
+# =======================================
+def crear_sesion(max_conexiones=MAX_POR_HOST, reintentos=3, backoff=0.5):
+    # Una sola sesión keep-alive con reintentos y backoff exponencial
+    reintento = Retry(
+        total=reintentos,
+        backoff_factor=backoff,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",),
+        respect_retry_after_header=True,
+    )
+    adaptador = HTTPAdapter(
+        pool_connections=max_conexiones,
+        pool_maxsize=max_conexiones,
+        max_retries=reintento,
+    )
+    sesion = requests.Session()
+    sesion.headers["User-Agent"] = USER_AGENT
+    sesion.mount("https://", adaptador)
+    sesion.mount("http://", adaptador)
+    return sesion
+
+_semaforos_host = {}
+_lock_semaforos = threading.Lock()
+
+def _semaforo_host(url, limite=MAX_POR_HOST):
+    host = urlparse(url).netloc
+    with _lock_semaforos:
+        if host not in _semaforos_host:
+            _semaforos_host[host] = threading.BoundedSemaphore(limite)
+        return _semaforos_host[host]
+
+def descargar_pagina(sesion, url, validador=None, timeout=10):
+    # Petición condicional: con ETag/Last-Modified previos, un 304 indica
+    # que la página no cambió y se devuelve html=None.
+    cabeceras = {}
+    if validador:
+        if validador.get("etag"):
+            cabeceras["If-None-Match"] = validador["etag"]
+        if validador.get("last_modified"):
+            cabeceras["If-Modified-Since"] = validador["last_modified"]
+
+    with _semaforo_host(url), metricas.tramo("http"):
+        resp = sesion.get(url, headers=cabeceras, timeout=timeout)
+
+    if resp.status_code == 304:
+        return None, validador
+    resp.raise_for_status()
+
+    nuevo_validador = {
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+    }
+    return resp.text, nuevo_validador
+
+# =======================================
+# PARSEO
+# =======================================
+def parsear_resultados(html, backend="auto"):
+    with metricas.tramo("parseo_html"):
+        sorteos = parsear_sorteos(html, backend)
+    with metricas.tramo("dataframe"):
+        return sorteos_a_dataframe(sorteos)
+
+# =======================================
+# SCRAPING
+# =======================================
+def extraer_resultados_por_anio(anio, sesion=None):
+    url = URL_ANIO.format(anio=anio)
+    print(f"🔎 Procesando año {anio}...")
+
+    try:
+        html, _ = descargar_pagina(sesion or requests, url)
+    except requests.RequestException as e:
+        print(f"❌ Error al obtener datos del año {anio}: {e}")
+        return pd.DataFrame()
+
+    try:
+        return parsear_resultados(html)
+    except ValueError as e:
+        print(f"❌ Error al parsear datos del año {anio}: {e}")
+        return pd.DataFrame()
+
+def extraer_resultados_anios(anios, max_workers=MAX_POR_HOST, sesion=None, validadores=None):
+    # Descarga concurrente de varios años sobre una sesión compartida.
+    # Devuelve {anio: DataFrame o None si no cambió (304)}, {anio: error}
+    # y los validadores actualizados para la próxima ejecución.
+    sesion = sesion or crear_sesion(max_conexiones=max_workers)
+    previos = dict(validadores or {})
+    validadores = dict(previos)
+    resultados, errores = {}, {}
+
+    def tarea(anio):
+        url = URL_ANIO.format(anio=anio)
+        html, validador = descargar_pagina(sesion, url, previos.get(url))
+        if html is None:
+            return url, None, validador
+        return url, parsear_resultados(html), validador
+
+    print(f"🔎 Descargando {len(anios)} años en paralelo ({max_workers} conexiones)...")
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futuros = {anio: pool.submit(tarea, anio) for anio in anios}
+        for anio, futuro in futuros.items():
+            try:
+                url, df, validador = futuro.result()
+            except (requests.RequestException, ValueError) as e:
+                errores[anio] = str(e)
+                print(f"❌ Error al obtener datos del año {anio}: {e}")
+                continue
+            resultados[anio] = df
+            if validador:
+                validadores[url] = validador
+
+    return resultados, errores, validadores
@@ -3,18 +3,20 @@
 # Adaptado para GitHub Actions usando secrets
 # ============================================================
 
+import argparse
 import asyncio
+import os
 import pandas as pd
 from datetime import datetime
 import pytz
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from playwright.async_api import async_playwright
-import gspread
-from google.oauth2.service_account import Credentials
-import os
-import json
+from urllib.parse import urlsplit
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+import cliente_google
+import metricas
+from alertas_movistar import enviar_alertas
+from espejo_sheets import EspejoHoja
+from precios_movistar import abrir_precios, formatear_precio, registrar_scraping
 
 # ---------------------------
 # CONFIG
@@ -25,112 +27,182 @@ SHEET_PAST = "past"
 HEADERS = ["timestamp","sku","producto","precio_oferta","marca"]
 CL_TZ = pytz.timezone("America/Santiago")
 
-# ---------------------------
-# CARGA DE CREDENCIALES DESDE SECRET
-# ---------------------------
-def cargar_credenciales_google():
-    creds_dict = json.loads(os.environ["GOOGLE_CREDENTIALS"])
-    creds = Credentials.from_service_account_info(
-        creds_dict,
-        scopes=[
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive"
-        ]
-    )
-    return gspread.authorize(creds)
-
-gc = cargar_credenciales_google()
-spreadsheet = gc.open_by_key(SPREADSHEET_ID)
-ws_latest = spreadsheet.worksheet(SHEET_LATEST)
-ws_past = spreadsheet.worksheet(SHEET_PAST)
-
 # ---------------------------
 # UTILIDADES
 # ---------------------------
-def overwrite_sheet_with_current_time(ws, df):
-    df_to_write = df.copy()
+def con_hora_actual(df):
     current_time = datetime.now(CL_TZ).strftime("%Y-%m-%d %H:%M:%S")
-    if "timestamp" in df_to_write.columns:
-        df_to_write["timestamp"] = current_time
-    ws.clear()
-    ws.update([df_to_write.columns.tolist()] + df_to_write.values.tolist())
+    return df.assign(timestamp=current_time)
+
+def foto_a_hoja(previos):
+    # Histórico (precio entero) -> mismas columnas que 'latest'
+    return previos.assign(precio_oferta=previos["precio"].map(formatear_precio))[HEADERS]
 
 # ---------------------------
 # SCRAPING MOVISTAR
 # ---------------------------
-async def scrape_movistar():
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            user_agent=("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                        "Chrome/120.0.0.0 Safari/537.36")
-        )
-        page = await context.new_page()
-        await page.goto("https://ww2.movistar.cl/ofertas/celulares-liberados/",
-                        wait_until="domcontentloaded", timeout=60000)
-        await page.wait_for_timeout(5000)
+SELECTOR_TARJETA = "a.cro-tarjeta"
+
+# Todas las tarjetas en una sola evaluación dentro de la página (una ida y
+# vuelta al navegador); las que no tienen nombre o precio quedan en null
+EXTRAER_TARJETAS_JS = """
+tarjetas => tarjetas.map(t => {
+    const nombre = t.querySelector("h2.of-card-name");
+    const precio = t.querySelector("p.of-price-saleprice");
+    if (!nombre || !precio) return null;
+    return {
+        timestamp: "",
+        sku: t.getAttribute("data-sap"),
+        producto: nombre.innerText.trim(),
+        precio_oferta: precio.innerText.trim(),
+        marca: t.getAttribute("data-brand"),
+    };
+})
+"""
 
-        cards = await page.query_selector_all("a.cro-tarjeta")
-        if not cards:
-            await browser.close()
-            raise RuntimeError("❌ No se encontraron tarjetas")
+URL_LISTADO = "https://ww2.movistar.cl/ofertas/celulares-liberados/"
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+              "AppleWebKit/537.36 (KHTML, like Gecko) "
+              "Chrome/120.0.0.0 Safari/537.36")
+
+# Modo liviano: las tarjetas sólo necesitan el HTML, el CSS (innerText
+# depende de qué está visible) y los scripts propios del sitio
+RECURSOS_BLOQUEADOS = {"image", "media", "font"}
+HOSTS_BLOQUEADOS = ("google-analytics.com", "googletagmanager.com", "doubleclick.net",
+                    "facebook.net", "facebook.com", "hotjar.com", "clarity.ms",
+                    "tiktok.com", "criteo.com", "taboola.com", "youtube.com")
+
+def es_prescindible(tipo, url):
+    host = urlsplit(url).hostname or ""
+    return tipo in RECURSOS_BLOQUEADOS or any(
+        host == h or host.endswith("." + h) for h in HOSTS_BLOQUEADOS
+    )
 
-        data = []
-        for card in cards:
+async def bloquear_recursos(route):
+    if es_prescindible(route.request.resource_type, route.request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def abrir_contexto(p, perfil=None, navegador_ws=None):
+    # Devuelve (contexto, cerrar). Con navegador_ws se usa un navegador ya
+    # levantado (browser server de Playwright) y al terminar sólo se cierra el
+    # contexto; con perfil, un contexto persistente que conserva la caché HTTP
+    # y las cookies entre ejecuciones
+    if navegador_ws:
+        browser = await p.chromium.connect(navegador_ws)
+        context = await browser.new_context(user_agent=USER_AGENT)
+        return context, context.close
+    if perfil:
+        context = await p.chromium.launch_persistent_context(
+            perfil, headless=True, user_agent=USER_AGENT)
+        return context, context.close
+    browser = await p.chromium.launch(headless=True)
+    context = await browser.new_context(user_agent=USER_AGENT)
+    return context, browser.close
+
+async def scrape_listado(context, url, limite):
+    async with limite:
+        page = await context.new_page()
+        try:
+            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+            # Se espera a que aparezca la primera tarjeta, no un tiempo fijo
             try:
-                data.append({
-                    "timestamp": "",
-                    "sku": await card.get_attribute("data-sap"),
-                    "producto": (await (await card.query_selector("h2.of-card-name")).inner_text()).strip(),
-                    "precio_oferta": (await (await card.query_selector("p.of-price-saleprice")).inner_text()).strip(),
-                    "marca": await card.get_attribute("data-brand")
-                })
-            except:
-                continue
-        await browser.close()
-    return pd.DataFrame(data)
+                await page.wait_for_selector(SELECTOR_TARJETA, timeout=30000)
+            except PlaywrightTimeoutError:
+                raise RuntimeError(f"❌ No se encontraron tarjetas en {url}")
+            registros = await page.eval_on_selector_all(SELECTOR_TARJETA, EXTRAER_TARJETAS_JS)
+        finally:
+            await page.close()
+    registros = [r for r in registros if r]
+    print(f"📄 {len(registros)} tarjetas en {url}")
+    return registros
+
+async def scrape_movistar(urls=(URL_LISTADO,), bloquear=True, perfil=None,
+                          navegador_ws=None, max_pestanas=4):
+    # Todas las categorías en pestañas de un mismo navegador, en paralelo
+    async with async_playwright() as p:
+        context, cerrar = await abrir_contexto(p, perfil, navegador_ws)
+        try:
+            if bloquear:
+                await context.route("**/*", bloquear_recursos)
+            limite = asyncio.Semaphore(max_pestanas)
+            resultados = await asyncio.gather(
+                *(scrape_listado(context, url, limite) for url in urls),
+                return_exceptions=True,
+            )
+        finally:
+            await cerrar()
+
+    registros = []
+    for url, resultado in zip(urls, resultados):
+        if isinstance(resultado, Exception):
+            print(f"⚠️ Falló {url}: {resultado}")
+        else:
+            registros.extend(resultado)
+    if not registros:
+        raise RuntimeError("❌ No se encontraron tarjetas")
+    # Un mismo equipo puede aparecer en varias categorías
+    return pd.DataFrame(registros, columns=HEADERS).drop_duplicates("sku").reset_index(drop=True)
 
 # ---------------------------
 # EJECUCIÓN
 # ---------------------------
-df_latest = asyncio.get_event_loop().run_until_complete(scrape_movistar())
-overwrite_sheet_with_current_time(ws_latest, df_latest)
-overwrite_sheet_with_current_time(ws_past, df_latest)
-print("✅ Hoja 'latest' y 'past' inicializadas con timestamp actual")
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--urls", nargs="+", default=[URL_LISTADO],
+                        help="Listados de Movistar a recorrer (una pestaña por URL)")
+    parser.add_argument("--sin-bloqueo", action="store_true",
+                        help="Carga imágenes, fuentes y scripts de terceros")
+    parser.add_argument("--perfil", default=os.environ.get("MOVISTAR_PERFIL"),
+                        help="Directorio de un contexto persistente (caché entre ejecuciones)")
+    parser.add_argument("--navegador-ws", default=os.environ.get("MOVISTAR_NAVEGADOR_WS"),
+                        help="Endpoint ws de un browser server de Playwright ya levantado")
+    parser.add_argument("--pestanas", type=int, default=4)
+    args = parser.parse_args(argv)
+    metricas.iniciar("scrapmovistar", urls=len(args.urls), bloqueo=not args.sin_bloqueo)
 
-# ---------------------------
-# COMPARACIÓN Y ALERTAS
-# ---------------------------
-try:
-    df_old = pd.DataFrame(ws_past.get_all_records())
-    merged = df_old.merge(df_latest, on="sku", suffixes=("_old","_new"))
-    changes = merged[merged["precio_oferta_old"] != merged["precio_oferta_new"]]
-
-    for _, row in changes.iterrows():
-        precio_old = float(row["precio_oferta_old"].replace("$","").replace(".","").replace(",","").strip())
-        precio_new = float(row["precio_oferta_new"].replace("$","").replace(".","").replace(",","").strip())
-        if precio_old == 0:
-            continue
-        diff_pct = abs(precio_new - precio_old) / precio_old
-        if diff_pct >= 0.5:
-            sender_email = "ari.cesped@gmail.com"
-            receiver_email = "ari.cesped@gmail.com"
-            password = "xmqycfdnigtmrsis"
-            message = MIMEMultipart("alternative")
-            message["Subject"] = f"🚨 Cambio ≥50%: {row['producto_old']}"
-            message["From"] = sender_email
-            message["To"] = receiver_email
-            text = (f"Producto: {row['producto_old']}\n"
-                    f"SKU: {row['sku']}\n"
-                    f"Precio anterior: {row['precio_oferta_old']}\n"
-                    f"Precio nuevo: {row['precio_oferta_new']}\n"
-                    f"Diferencia: {diff_pct*100:.1f}%")
-            message.attach(MIMEText(text, "plain"))
-            with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-                server.login(sender_email, password)
-                server.sendmail(sender_email, receiver_email, message.as_string())
-            print(f"📧 Alerta enviada: {row['producto_old']} ({diff_pct*100:.1f}%)")
-
-except Exception as e:
-    print("❌ Error procesando alertas:", e)
+    # Primero el scraping: si falla no se llega a autorizar Google Sheets
+    with metricas.tramo("scraping"):
+        df_latest = asyncio.run(scrape_movistar(
+            args.urls, bloquear=not args.sin_bloqueo, perfil=args.perfil,
+            navegador_ws=args.navegador_ws, max_pestanas=args.pestanas,
+        ))
+
+    # La comparación se hace contra el histórico local, antes de escribir nada
+    timestamp = datetime.now(CL_TZ).strftime("%Y-%m-%d %H:%M:%S")
+    conn = abrir_precios()
+    try:
+        # Histórico y alertas pendientes se guardan juntos; las alertas van
+        # antes que Sheets y, si el envío falla, quedan para la próxima ejecución
+        with metricas.tramo("historico_precios"):
+            previos, _ = registrar_scraping(conn, df_latest, timestamp)
+
+        # Un solo resumen por ejecución, sin repetir SKU y precio ya alertados
+        try:
+            with metricas.tramo("alertas"):
+                enviar_alertas(conn)
+        except Exception as e:
+            print("❌ Error enviando alertas (quedan pendientes):", e)
+
+        with metricas.tramo("sheets_sync"):
+            actualizar_hojas(conn, df_latest, previos)
+    finally:
+        conn.close()
+
+def actualizar_hojas(conn, df_latest, previos):
+    ws_latest = cliente_google.hoja(SPREADSHEET_ID, SHEET_LATEST)
+    ws_past = cliente_google.hoja(SPREADSHEET_ID, SHEET_PAST)
+
+    # Sólo se escriben las filas cuyo SKU cambió; en 'latest' el timestamp
+    # de cada fila es el de la última vez que cambió
+    EspejoHoja(conn, SHEET_LATEST).sincronizar(ws_latest, con_hora_actual(df_latest),
+                                               ignorar=("timestamp",))
+    # 'past' guarda la foto anterior (último precio conocido de cada SKU);
+    # en la primera ejecución no hay foto anterior y se usa la actual
+    df_past = con_hora_actual(df_latest) if previos.empty else foto_a_hoja(previos)
+    EspejoHoja(conn, SHEET_PAST).sincronizar(ws_past, df_past)
+    print("✅ Hojas 'latest' y 'past' actualizadas")
+
+if __name__ == "__main__":
+    main()
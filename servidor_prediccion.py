@@ -0,0 +1,183 @@
+# =======================================
+# SERVIDOR LOCAL DE PREDICCIÓN
+# Mantiene ambos modelos cargados entre ejecuciones de main.py:
+#   python servidor_prediccion.py --puerto 8501
+#   python main.py --servidor http://127.0.0.1:8501
+# Los pesos se recargan sólo si cambia el .h5 (mtime/tamaño y hash).
+# =======================================
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from ensamble import ensemble_predict, simulacion_monte_carlo
+
+PUERTO = 8501
+
+# =======================================
+# CACHÉ DE MODELOS
+# =======================================
+def _firma(ruta):
+    st = os.stat(ruta)
+    return st.st_mtime_ns, st.st_size
+
+def _hash(ruta):
+    h = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+class CacheModelos:
+    def __init__(self, seq_length=10, ruta_lstm=None, ruta_trans=None):
+        from modelos import RUTA_PESOS_LSTM, RUTA_PESOS_TRANS
+
+        self.seq_length = seq_length
+        self.rutas = (ruta_lstm or RUTA_PESOS_LSTM, ruta_trans or RUTA_PESOS_TRANS)
+        self.modelos = None
+        self.predictor = None
+        self.firmas = None
+        self.hashes = None
+        self.lock = threading.RLock()
+
+    def _cargar(self):
+        from modelos import crear_modelo_lstm, crear_modelo_transformer, crear_predictor_ensamble
+
+        if self.modelos is None:
+            self.modelos = (crear_modelo_lstm(self.seq_length),
+                            crear_modelo_transformer(self.seq_length))
+            self.predictor = crear_predictor_ensamble(*self.modelos, self.seq_length)
+        for modelo, ruta in zip(self.modelos, self.rutas):
+            modelo.load_weights(ruta)
+        print(f"📥 Pesos cargados: {', '.join(self.rutas)}")
+
+    def asegurar_actualizados(self):
+        # Un stat por archivo en cada consulta; el hash sólo se calcula si
+        # cambió la firma, para no recargar por un simple touch.
+        with self.lock:
+            firmas = tuple(_firma(r) for r in self.rutas)
+            if firmas == self.firmas:
+                return
+            hashes = tuple(_hash(r) for r in self.rutas)
+            if hashes != self.hashes:
+                self._cargar()
+                self.hashes = hashes
+            self.firmas = firmas
+
+    def predecir(self, secuencias):
+        self.asegurar_actualizados()
+        entrada = np.asarray(secuencias, dtype=np.int32).reshape(-1, self.seq_length)
+        with self.lock:
+            return self.predictor(entrada)
+
+# =======================================
+# HTTP
+# =======================================
+def validar_secuencia(secuencia, seq_length):
+    # Errores del cliente como ValueError: el manejador responde 400
+    if not isinstance(secuencia, list) or len(secuencia) != seq_length:
+        raise ValueError(f"'secuencia' debe ser una lista de {seq_length} números")
+    for n in secuencia:
+        if isinstance(n, bool) or not isinstance(n, int) or not 0 <= n <= 9:
+            raise ValueError(f"'secuencia' sólo admite enteros de 0 a 9 (recibido {n!r})")
+    return secuencia
+
+def respuesta_prediccion(cache, secuencia, num_simulaciones=0, semilla=None):
+    inicio = time.perf_counter()
+    validar_secuencia(secuencia, cache.seq_length)
+    if num_simulaciones < 0:
+        raise ValueError("'simulaciones' no puede ser negativo")
+    p_lstm, p_trans = cache.predecir([secuencia])
+    pred_clase, pred_prob = ensemble_predict([p_lstm, p_trans])
+    respuesta = {
+        "lstm": p_lstm[0].tolist(),
+        "transformer": p_trans[0].tolist(),
+        "ensamble": {"clase": int(pred_clase[0]), "prob": float(pred_prob[0])},
+    }
+    if num_simulaciones:
+        conteo = simulacion_monte_carlo((p_lstm[0] + p_trans[0]) / 2, num_simulaciones,
+                                        rng=np.random.default_rng(semilla))
+        respuesta["monte_carlo"] = conteo.tolist()
+    respuesta["ms"] = (time.perf_counter() - inicio) * 1000
+    return respuesta
+
+def crear_manejador(cache):
+    class Manejador(BaseHTTPRequestHandler):
+        def _responder(self, codigo, cuerpo):
+            datos = json.dumps(cuerpo).encode("utf-8")
+            self.send_response(codigo)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(datos)))
+            self.end_headers()
+            self.wfile.write(datos)
+
+        def do_GET(self):
+            if self.path == "/salud":
+                self._responder(200, {"ok": True, "pesos": cache.hashes})
+            else:
+                self._responder(404, {"error": "ruta desconocida"})
+
+        def do_POST(self):
+            if self.path != "/predecir":
+                self._responder(404, {"error": "ruta desconocida"})
+                return
+            try:
+                largo = int(self.headers.get("Content-Length", 0))
+                consulta = json.loads(self.rfile.read(largo) or b"{}")
+                respuesta = respuesta_prediccion(
+                    cache, consulta["secuencia"], int(consulta.get("simulaciones", 0)),
+                    consulta.get("semilla"),
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                self._responder(400, {"error": str(e)})
+                return
+            except OSError as e:
+                self._responder(503, {"error": f"Pesos no disponibles: {e}"})
+                return
+            self._responder(200, respuesta)
+
+        def log_message(self, formato, *args):
+            pass
+
+    return Manejador
+
+# =======================================
+# CLIENTE
+# =======================================
+def consultar_servidor(url, secuencia, num_simulaciones=0, timeout=5):
+    cuerpo = json.dumps({
+        "secuencia": [int(n) for n in secuencia],
+        "simulaciones": num_simulaciones,
+    }).encode("utf-8")
+    peticion = urllib.request.Request(
+        url.rstrip("/") + "/predecir", data=cuerpo,
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(peticion, timeout=timeout) as resp:
+        return json.loads(resp.read())
+
+# =======================================
+# MAIN
+# =======================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--seq-length", type=int, default=10)
+    args = parser.parse_args()
+
+    cache = CacheModelos(seq_length=args.seq_length)
+    cache.asegurar_actualizados()
+
+    servidor = ThreadingHTTPServer((args.host, args.puerto), crear_manejador(cache))
+    print(f"🚀 Servidor de predicción en http://{args.host}:{args.puerto}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        servidor.server_close()
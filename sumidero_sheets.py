@@ -0,0 +1,286 @@
+# =======================================
+# SUMIDERO DE GOOGLE SHEETS
+# Las filas se encolan primero en un spool SQLite en disco y se envían
+# con un solo append_rows por hoja (o un solo batch_update para varias).
+# Un 429 (cuota) o 5xx se reintenta con Retry-After o espera
+# exponencial; si aun así falla, las filas quedan en el spool y se
+# envían en la siguiente ejecución. Cada fila lleva una clave: encolar o
+# reenviar la misma clave dos veces no duplica la fila en la hoja.
+# =======================================
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import numpy as np
+
+RUTA_SPOOL = os.environ.get("LOTO3_SPOOL", "spool_sheets.sqlite")
+CODIGOS_REINTENTABLES = {429, 500, 502, 503, 504}
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS pendientes (
+    clave   TEXT PRIMARY KEY,
+    hoja    TEXT NOT NULL,
+    fila    TEXT NOT NULL,
+    lote    TEXT,
+    creado  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS enviados (
+    clave   TEXT PRIMARY KEY,
+    hoja    TEXT NOT NULL,
+    enviado TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS hojas_sincronizadas (
+    hoja         TEXT PRIMARY KEY,
+    filas        INTEGER NOT NULL,
+    sincronizada TEXT NOT NULL
+);
+"""
+
+# =======================================
+# REINTENTOS
+# =======================================
+def codigo_http(error):
+    # gspread.exceptions.APIError (y la hoja falsa) exponen response.status_code
+    return getattr(getattr(error, "response", None), "status_code", None)
+
+def segundos_retry_after(valor, ahora=None):
+    # Retry-After admite segundos ("30") o una fecha HTTP; None si no se entiende
+    if valor is None:
+        return None
+    try:
+        return max(float(valor), 0.0)
+    except (TypeError, ValueError):
+        pass
+    try:
+        fecha = parsedate_to_datetime(str(valor))
+    except (TypeError, ValueError, IndexError):
+        return None
+    if fecha.tzinfo is None:
+        fecha = fecha.replace(tzinfo=timezone.utc)
+    return max((fecha - (ahora or datetime.now(timezone.utc))).total_seconds(), 0.0)
+
+def con_reintentos(funcion, max_intentos=6, espera_base=1.0, espera_max=64.0, dormir=time.sleep):
+    for intento in range(max_intentos):
+        try:
+            return funcion()
+        except Exception as e:
+            if codigo_http(e) not in CODIGOS_REINTENTABLES or intento == max_intentos - 1:
+                raise
+            cabeceras = getattr(getattr(e, "response", None), "headers", None) or {}
+            espera = segundos_retry_after(cabeceras.get("Retry-After"))
+            if espera is None:
+                espera = espera_base * 2 ** intento * (1 + random.random() * 0.25)
+            espera = min(espera, espera_max)
+            print(f"⏳ Sheets respondió {codigo_http(e)}, reintento en {espera:.1f}s "
+                  f"({intento + 1}/{max_intentos - 1})")
+            dormir(espera)
+
+# =======================================
+# CELDAS (APPENDCELLS)
+# =======================================
+_EPOCA_SHEETS = datetime(1899, 12, 30)
+
+def celda_sheets(valor):
+    # Equivalente a USER_ENTERED para los tipos que escriben los scripts:
+    # números como número y fechas ISO como fecha con formato
+    if isinstance(valor, (bool, np.bool_)):
+        return {"userEnteredValue": {"boolValue": bool(valor)}}
+    if isinstance(valor, (int, float, np.integer, np.floating)):
+        return {"userEnteredValue": {"numberValue": float(valor)}}
+    texto = str(valor)
+    for formato, tipo in (("%Y-%m-%d %H:%M:%S", "DATE_TIME"), ("%Y-%m-%d", "DATE")):
+        try:
+            fecha = datetime.strptime(texto, formato)
+        except ValueError:
+            continue
+        serial = (fecha - _EPOCA_SHEETS).total_seconds() / 86400
+        patron = "yyyy-mm-dd hh:mm:ss" if tipo == "DATE_TIME" else "yyyy-mm-dd"
+        return {"userEnteredValue": {"numberValue": serial},
+                "userEnteredFormat": {"numberFormat": {"type": tipo, "pattern": patron}}}
+    if texto.startswith("="):
+        return {"userEnteredValue": {"formulaValue": texto}}
+    return {"userEnteredValue": {"stringValue": texto}}
+
+def valor_comparable(valor):
+    # Forma común de lo enviado y de lo leído con UNFORMATTED_VALUE: fechas ISO
+    # como serial de Sheets y números como float, el resto como texto
+    celda = celda_sheets(valor)["userEnteredValue"]
+    if "numberValue" in celda:
+        return round(celda["numberValue"], 6)
+    texto = str(next(iter(celda.values())))
+    try:
+        return round(float(texto), 6)
+    except ValueError:
+        return texto
+
+def peticion_append_cells(id_hoja, filas):
+    return {"appendCells": {
+        "sheetId": id_hoja,
+        "rows": [{"values": [celda_sheets(v) for v in fila]} for fila in filas],
+        "fields": "userEnteredValue,userEnteredFormat.numberFormat",
+    }}
+
+# =======================================
+# SUMIDERO
+# =======================================
+def clave_fila(hoja, fila):
+    return hashlib.sha1(json.dumps([hoja, fila], default=str).encode("utf-8")).hexdigest()
+
+class SumideroSheets:
+    def __init__(self, abrir_hoja, ruta=RUTA_SPOOL, value_input_option="USER_ENTERED",
+                 max_intentos=6, espera_base=1.0, dormir=time.sleep, abrir_libro=None):
+        # abrir_hoja: callable(nombre) -> worksheet (gspread o HojaFalsa)
+        # abrir_libro: callable() -> spreadsheet; si se da, las filas de varias
+        # hojas se envían juntas en un solo batch_update (appendCells)
+        self.abrir_hoja = abrir_hoja
+        self.abrir_libro = abrir_libro
+        self.conn = sqlite3.connect(ruta)
+        self.conn.executescript(ESQUEMA)
+        self.value_input_option = value_input_option
+        self.reintentos = {"max_intentos": max_intentos, "espera_base": espera_base,
+                           "dormir": dormir}
+
+    def encolar(self, hoja, fila, clave=None):
+        return self.encolar_varias(hoja, [fila], [clave])
+
+    def encolar_varias(self, hoja, filas, claves=None):
+        claves = claves or [None] * len(filas)
+        ahora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        nuevas = 0
+        with self.conn:
+            for fila, clave in zip(filas, claves):
+                clave = clave or clave_fila(hoja, fila)
+                if self.conn.execute("SELECT 1 FROM enviados WHERE clave = ?", (clave,)).fetchone():
+                    continue
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO pendientes (clave, hoja, fila, creado) VALUES (?, ?, ?, ?)",
+                    (clave, hoja, json.dumps(fila, default=str), ahora),
+                )
+                nuevas += cursor.rowcount
+        return nuevas
+
+    def pendientes(self, hoja=None):
+        consulta = "SELECT COUNT(*) FROM pendientes" + (" WHERE hoja = ?" if hoja else "")
+        return self.conn.execute(consulta, (hoja,) if hoja else ()).fetchone()[0]
+
+    # ----- Índice local de claves ya escritas -----
+    def registrado(self, clave):
+        # Consulta local O(1): enviada o pendiente de envío
+        return any(
+            self.conn.execute(f"SELECT 1 FROM {tabla} WHERE clave = ?", (clave,)).fetchone()
+            for tabla in ("enviados", "pendientes")
+        )
+
+    def hoja_sincronizada(self, hoja):
+        return self.conn.execute(
+            "SELECT 1 FROM hojas_sincronizadas WHERE hoja = ?", (hoja,)
+        ).fetchone() is not None
+
+    def registrar_existentes(self, hoja, claves, filas):
+        # Carga inicial del índice con lo que ya está en la hoja (una sola vez)
+        ahora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO enviados (clave, hoja, enviado) VALUES (?, ?, ?)",
+                [(c, hoja, ahora) for c in claves],
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO hojas_sincronizadas (hoja, filas, sincronizada) "
+                "VALUES (?, ?, ?)", (hoja, filas, ahora),
+            )
+
+    def _ya_en_hoja(self, worksheet, filas):
+        # Recuperación tras un corte a mitad de envío: ¿llegó el lote a la hoja?
+        # Se lee sin formato (lo mostrado depende de USER_ENTERED y del formato
+        # de fecha) y se compara normalizado
+        columna = con_reintentos(
+            lambda: worksheet.col_values(1, value_render_option="UNFORMATTED_VALUE"),
+            **self.reintentos)
+        cola = columna[-len(filas):] if len(columna) >= len(filas) else []
+        return [valor_comparable(v) for v in cola] == [valor_comparable(f[0]) for f in filas]
+
+    def _marcar_enviados(self, claves, hoja):
+        ahora = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO enviados (clave, hoja, enviado) VALUES (?, ?, ?)",
+                [(c, hoja, ahora) for c in claves],
+            )
+            self.conn.executemany("DELETE FROM pendientes WHERE clave = ?", [(c,) for c in claves])
+
+    def _recuperar_lotes(self, hoja, worksheet):
+        # Lotes que quedaron a medio enviar en una ejecución anterior
+        for (lote,) in self.conn.execute(
+            "SELECT DISTINCT lote FROM pendientes WHERE hoja = ? AND lote IS NOT NULL", (hoja,)
+        ).fetchall():
+            filas = self.conn.execute(
+                "SELECT clave, fila FROM pendientes WHERE lote = ? AND hoja = ? ORDER BY rowid",
+                (lote, hoja),
+            ).fetchall()
+            if self._ya_en_hoja(worksheet, [json.loads(f) for _, f in filas]):
+                self._marcar_enviados([c for c, _ in filas], hoja)
+            else:
+                with self.conn:
+                    self.conn.execute("UPDATE pendientes SET lote = NULL WHERE lote = ? AND hoja = ?",
+                                      (lote, hoja))
+
+    def _marcar_lote(self, claves):
+        lote = hashlib.sha1("".join(claves).encode()).hexdigest()[:12]
+        with self.conn:
+            self.conn.executemany("UPDATE pendientes SET lote = ? WHERE clave = ?",
+                                  [(lote, c) for c in claves])
+
+    def vaciar(self):
+        por_hoja = {}
+        hojas = [h for (h,) in self.conn.execute("SELECT DISTINCT hoja FROM pendientes")]
+        for hoja in hojas:
+            worksheet = self.abrir_hoja(hoja)
+            self._recuperar_lotes(hoja, worksheet)
+            filas = self.conn.execute(
+                "SELECT clave, fila FROM pendientes WHERE hoja = ? ORDER BY rowid", (hoja,)
+            ).fetchall()
+            if filas:
+                por_hoja[hoja] = (worksheet, [c for c, _ in filas], [json.loads(f) for _, f in filas])
+        if not por_hoja:
+            return {}
+
+        if self.abrir_libro is not None and len(por_hoja) > 1:
+            # Todas las hojas en una sola llamada
+            self._marcar_lote([c for _, claves, _ in por_hoja.values() for c in claves])
+            peticiones = [peticion_append_cells(ws.id, valores)
+                          for ws, _, valores in por_hoja.values()]
+            libro = self.abrir_libro()
+            con_reintentos(lambda: libro.batch_update({"requests": peticiones}), **self.reintentos)
+            for hoja, (_, claves, _) in por_hoja.items():
+                self._marcar_enviados(claves, hoja)
+            total = sum(len(v) for _, _, v in por_hoja.values())
+            print(f"📤 {total} fila(s) enviadas a {len(por_hoja)} hojas en una sola llamada")
+            return {hoja: len(v) for hoja, (_, _, v) in por_hoja.items()}
+
+        enviadas = {}
+        for hoja, (worksheet, claves, valores) in por_hoja.items():
+            self._marcar_lote(claves)
+            con_reintentos(lambda: worksheet.append_rows(
+                valores, value_input_option=self.value_input_option), **self.reintentos)
+            self._marcar_enviados(claves, hoja)
+            enviadas[hoja] = len(valores)
+            print(f"📤 {len(valores)} fila(s) enviadas a {hoja} en una sola llamada")
+        return enviadas
+
+    def intentar_vaciar(self):
+        # Para los scripts programados: un fallo no aborta la ejecución, las
+        # filas siguen en el spool (que el workflow guarda en caché)
+        try:
+            return self.vaciar()
+        except Exception as e:
+            print(f"⚠️ No se pudo enviar a Google Sheets ({e}); "
+                  f"{self.pendientes()} fila(s) quedan en el spool para la próxima ejecución")
+            return None
+
+    def cerrar(self):
+        self.conn.close()
@@ -3,155 +3,199 @@
 # =======================================
 import os
 import json
-import requests
-from bs4 import BeautifulSoup
+import time
+import argparse
 import pandas as pd
 from datetime import datetime
-import numpy as np
-import tensorflow as tf
-from tensorflow.keras.models import Sequential, Model
-from tensorflow.keras.layers import (
-    LSTM, Dense, Embedding, Input, LayerNormalization,
-    MultiHeadAttention, GlobalAveragePooling1D
+
+import metricas
+with metricas.tramo("import_tf"):
+    import tensorflow as tf
+    from tensorflow.keras.callbacks import EarlyStopping
+
+from historial import actualizar_historial
+from preprocesamiento import preparar_datos_lstm, dataset_entrenamiento
+from modelos import (
+    crear_modelo_lstm, crear_modelo_transformer, crear_modelo_conjunto,
+    RUTA_PESOS_LSTM, RUTA_PESOS_TRANS
 )
-from tensorflow.keras.utils import to_categorical
+from exportar import exportar_tflite
+from predictor_tflite import MODOS
 
-# =======================================
-# DICCIONARIO MESES
-# =======================================
-MESES = {
-    "ene.": "01", "feb.": "02", "mar.": "03", "abr.": "04",
-    "may.": "05", "jun.": "06", "jul.": "07", "ago.": "08",
-    "sep.": "09", "oct.": "10", "nov.": "11", "dic.": "12",
-}
-
-def corregir_fecha(fecha_str):
-    for mes_abrev, mes_num in MESES.items():
-        if mes_abrev in fecha_str:
-            fecha_str = fecha_str.replace(mes_abrev, mes_num)
-            return datetime.strptime(fecha_str, "%d %m %Y")
-    raise ValueError(f"Mes no reconocido en fecha '{fecha_str}'")
+RUTA_CHECKPOINT = "checkpoint_entrenamiento.json"
 
 # =======================================
-# SCRAPING
+# CHECKPOINT (ÚLTIMO SORTEO ENTRENADO)
 # =======================================
-def extraer_resultados_por_anio(anio):
-    url = f"https://www.loterias.com/loto-3/resultados/{anio}"
-    print(f"🔎 Procesando año {anio}...")
-    try:
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
-    except:
-        print(f"❌ Error al obtener datos del año {anio}")
-        return pd.DataFrame()
-
-    soup = BeautifulSoup(resp.text, "html.parser")
-    tabla = soup.find("table", class_="archives")
-    if not tabla:
-        return pd.DataFrame()
-
-    datos = []
-    for fila in tabla.tbody.find_all("tr"):
-        celdas = fila.find_all("td")
-        if len(celdas) < 2:
-            continue
-        enlace = celdas[0].find("a")
-        if not enlace:
-            continue
-        texto_fecha = enlace.get_text(separator=" ").strip()
-        partes = texto_fecha.split()
-        if len(partes) < 3:
-            continue
-        fecha_raw = " ".join(partes[1:])
-        try:
-            fecha = corregir_fecha(fecha_raw)
-        except:
-            continue
-        listas = celdas[1].find_all("ul", class_="balls")
-        for lista in listas:
-            try:
-                tipo = lista.find("li").text.strip()
-                numeros = [li.text.strip() for li in lista.find_all("li", class_="ball")]
-                if len(numeros) != 3:
-                    continue
-                ultimo = int(numeros[2])
-                datos.append({
-                    "Fecha": fecha,
-                    "Turno": tipo,
-                    "Último Número": ultimo,
-                })
-            except:
-                pass
-    return pd.DataFrame(datos)
+def leer_checkpoint(ruta=RUTA_CHECKPOINT):
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta) as f:
+        return json.load(f)
+
+def guardar_checkpoint(df, modo, ruta=RUTA_CHECKPOINT):
+    ultimo = df.sort_values("Fecha", kind="stable").iloc[-1]
+    checkpoint = {
+        "ultima_fecha": ultimo["Fecha"].strftime("%Y-%m-%d"),
+        "ultimo_turno": ultimo["Turno"],
+        "modo": modo,
+        "entrenado": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    with open(ruta, "w") as f:
+        json.dump(checkpoint, f, indent=2, ensure_ascii=False)
+    return checkpoint
+
+def posicion_checkpoint(df, checkpoint):
+    # Índice (en la serie ordenada) del último sorteo ya entrenado
+    df = df.sort_values("Fecha", kind="stable").reset_index(drop=True)
+    fecha = pd.Timestamp(checkpoint["ultima_fecha"])
+    exacto = df.index[(df["Fecha"] == fecha) & (df["Turno"] == checkpoint.get("ultimo_turno"))]
+    if len(exacto):
+        return int(exacto[-1])
+    anteriores = df.index[df["Fecha"] <= fecha]
+    return int(anteriores[-1]) if len(anteriores) else -1
 
 # =======================================
-# PREPROCESAMIENTO
+# HILOS (RUNNERS SÓLO CPU)
 # =======================================
-def preparar_datos_lstm(df, seq_length=10):
-    df = df.sort_values("Fecha").reset_index(drop=True)
-    numeros = df["Último Número"].values
-    X, y = [], []
-    for i in range(len(numeros) - seq_length):
-        X.append(numeros[i:i+seq_length])
-        y.append(numeros[i+seq_length])
-    return np.array(X), np.array(y)
+def configurar_hilos(intra=0, inter=0):
+    # Debe llamarse antes de ejecutar cualquier operación de TensorFlow.
+    # intra: hilos por operación (matmul, LSTM); inter: operaciones en paralelo,
+    # con 2 las ramas LSTM y Transformer del grafo conjunto avanzan a la vez.
+    intra = intra or os.cpu_count() or 1
+    inter = inter or 2
+    tf.config.threading.set_intra_op_parallelism_threads(intra)
+    tf.config.threading.set_inter_op_parallelism_threads(inter)
+    print(f"🧵 Hilos TensorFlow: intra={intra}, inter={inter}")
 
 # =======================================
-# MODELOS
+# ENTRENAMIENTO
 # =======================================
-def crear_modelo_lstm(seq_length, num_classes=10):
-    model = Sequential([
-        Embedding(input_dim=num_classes, output_dim=32, input_length=seq_length),
-        LSTM(64),
-        Dense(num_classes, activation='softmax')
-    ])
-    model.compile(loss='categorical_crossentropy', optimizer='adam')
-    return model
-
-def crear_modelo_transformer(seq_length, num_classes=10, embed_dim=32, heads=2, ff_dim=64):
-    inputs = Input(shape=(seq_length,), dtype="int32")
-    x = Embedding(num_classes, embed_dim)(inputs)
-    attn = MultiHeadAttention(num_heads=heads, key_dim=embed_dim)(x, x)
-    out1 = LayerNormalization(epsilon=1e-6)(x + attn)
-    ff = Dense(ff_dim, activation="relu")(out1)
-    ff = Dense(embed_dim)(ff)
-    out2 = LayerNormalization(epsilon=1e-6)(out1 + ff)
-    x = GlobalAveragePooling1D()(out2)
-    outputs = Dense(num_classes, activation="softmax")(x)
-    model = Model(inputs, outputs)
-    model.compile(optimizer="adam", loss="categorical_crossentropy")
-    return model
+class RendimientoEpoca(tf.keras.callbacks.Callback):
+    def __init__(self, muestras):
+        super().__init__()
+        self.muestras = muestras
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.inicio = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        segundos = time.perf_counter() - self.inicio
+        por_segundo = self.muestras / max(segundos, 1e-9)
+        if logs is not None:
+            logs["muestras_s"] = por_segundo
+        print(f"⏱️ Época {epoch + 1}: {self.muestras} muestras en {segundos:.2f}s "
+              f"({por_segundo:,.0f} muestras/s)")
+
+def entrenar(modelo, X, y, epocas, paciencia, validacion=0.1, batch_size=32, semilla=None):
+    # Validación con el último tramo de ventanas, como validation_split
+    n_val = int(len(y) * validacion)
+    corte = len(y) - n_val
+    salidas = modelo.output_names
+    datos = dataset_entrenamiento(X[:corte], y[:corte], batch_size, salidas, seed=semilla)
+    datos_val = None
+    if n_val:
+        datos_val = dataset_entrenamiento(X[corte:], y[corte:], batch_size, salidas,
+                                          shuffle=False)
+
+    callbacks = [RendimientoEpoca(corte)]
+    if paciencia:
+        monitor = "val_loss" if n_val else "loss"
+        callbacks.append(EarlyStopping(monitor=monitor, patience=paciencia,
+                                       restore_best_weights=True))
+    return modelo.fit(datos, epochs=epocas, validation_data=datos_val,
+                      callbacks=callbacks)
 
 # =======================================
 # MAIN
 # =======================================
 if __name__ == "__main__":
-    # Descargar resultados de los últimos 10 años
-    año_actual = datetime.now().year
-    años = list(range(año_actual, año_actual - 10, -1))
-    resultados = pd.DataFrame()
-    for anio in años:
-        df = extraer_resultados_por_anio(anio)
-        if not df.empty:
-            resultados = pd.concat([resultados, df], ignore_index=True)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--incremental", action="store_true",
+                        help="Ajusta los pesos existentes sólo con los sorteos nuevos")
+    parser.add_argument("--epocas", type=int, default=50)
+    parser.add_argument("--epocas-ajuste", type=int, default=5)
+    parser.add_argument("--repaso", type=int, default=256,
+                        help="Ventanas recientes que se repasan junto a las nuevas (incremental)")
+    parser.add_argument("--paciencia", type=int, default=5,
+                        help="Early stopping; 0 lo desactiva")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--exportar", action="store_true",
+                        help="Exporta el artefacto TFLite también tras un ajuste incremental")
+    parser.add_argument("--cuantizaciones", nargs="+", choices=MODOS, default=["float32"],
+                        help="Variantes TFLite a exportar (float32, float16, int8)")
+    parser.add_argument("--hilos-intra", type=int, default=0,
+                        help="Hilos por operación (0 = núcleos disponibles)")
+    parser.add_argument("--hilos-inter", type=int, default=0,
+                        help="Operaciones en paralelo (0 = 2)")
+    args, _ = parser.parse_known_args()
+    metricas.iniciar("train", incremental=args.incremental)
+    configurar_hilos(args.hilos_intra, args.hilos_inter)
+
+    # Resultados de los últimos 10 años (histórico local + año en curso)
+    with metricas.tramo("historial"):
+        resultados = actualizar_historial(num_anios=10)
     print(f"🔔 Total resultados extraídos: {len(resultados)}")
 
     # Preparar datos
     seq_length = 10
-    X, y = preparar_datos_lstm(resultados, seq_length)
+    with metricas.tramo("preprocesamiento"):
+        X, y = preparar_datos_lstm(resultados, seq_length)
     num_classes = 10
-    y_cat = to_categorical(y, num_classes=num_classes)
-
-    # ================= ENTRENAR LSTM =================
-    modelo_lstm = crear_modelo_lstm(seq_length, num_classes)
-    print("⚡ Entrenando LSTM...")
-    modelo_lstm.fit(X, y_cat, epochs=50, batch_size=32, validation_split=0.1)
-    modelo_lstm.save_weights("weights_lstm.h5")
-    print("✅ Pesos LSTM guardados en weights_lstm.h5")
-
-    # ================= ENTRENAR TRANSFORMER =================
-    modelo_trans = crear_modelo_transformer(seq_length, num_classes)
-    print("⚡ Entrenando Transformer...")
-    modelo_trans.fit(X, y_cat, epochs=50, batch_size=32, validation_split=0.1)
-    modelo_trans.save_weights("weights_trans.h5")
-    print("✅ Pesos Transformer guardados en weights_trans.h5")
+
+    checkpoint = leer_checkpoint()
+    pesos_existen = os.path.exists(RUTA_PESOS_LSTM) and os.path.exists(RUTA_PESOS_TRANS)
+    incremental = args.incremental and pesos_existen and checkpoint is not None
+    if args.incremental and not incremental:
+        print("⚠️ Sin pesos o checkpoint previos: se entrena desde cero")
+
+    with metricas.tramo("construir_modelos"):
+        modelo_lstm = crear_modelo_lstm(seq_length, num_classes)
+        modelo_trans = crear_modelo_transformer(seq_length, num_classes)
+
+    if incremental:
+        # Ventanas cuyo objetivo es posterior al último sorteo entrenado
+        pos = posicion_checkpoint(resultados, checkpoint)
+        primera_nueva = max(pos + 1 - seq_length, 0)
+        nuevas = len(y) - primera_nueva
+        if nuevas <= 0:
+            print(f"✅ Sin sorteos nuevos desde {checkpoint['ultima_fecha']} "
+                  f"({checkpoint['ultimo_turno']}), nada que entrenar")
+            raise SystemExit(0)
+
+        desde = max(len(y) - max(nuevas, args.repaso), 0)
+        X, y = X[desde:], y[desde:]
+        epocas, validacion = args.epocas_ajuste, 0.0
+        # Sin validación se vigila la pérdida de entrenamiento; con tan pocas
+        # épocas la paciencia debe ser menor que ellas para poder cortar
+        paciencia = min(args.paciencia, max(epocas - 1, 0))
+        with metricas.tramo("carga_pesos"):
+            modelo_lstm.load_weights(RUTA_PESOS_LSTM)
+            modelo_trans.load_weights(RUTA_PESOS_TRANS)
+        print(f"🔁 Ajuste incremental: {nuevas} ventanas nuevas, {len(y)} en total")
+    else:
+        epocas, validacion, paciencia = args.epocas, 0.1, args.paciencia
+
+    # ================= ENTRENAR LSTM + TRANSFORMER =================
+    # Un solo grafo con dos salidas: cada lote del pipeline alimenta ambos modelos
+    print("⚡ Entrenando LSTM y Transformer en paralelo...")
+    with metricas.tramo("entrenamiento"):
+        conjunto = crear_modelo_conjunto(modelo_lstm, modelo_trans, seq_length)
+        entrenar(conjunto, X, y, epocas, paciencia, validacion, args.batch_size)
+
+    modelo_lstm.save_weights(RUTA_PESOS_LSTM)
+    print(f"✅ Pesos LSTM guardados en {RUTA_PESOS_LSTM}")
+    modelo_trans.save_weights(RUTA_PESOS_TRANS)
+    print(f"✅ Pesos Transformer guardados en {RUTA_PESOS_TRANS}")
+
+    checkpoint = guardar_checkpoint(resultados, "incremental" if incremental else "completo")
+    print(f"📌 Último sorteo entrenado: {checkpoint['ultima_fecha']} ({checkpoint['ultimo_turno']})")
+
+    # ================= ARTEFACTO DE INFERENCIA =================
+    # Tras un ajuste incremental el artefacto queda desactualizado y main.py
+    # usa el forward NumPy con los .h5, salvo que se pida --exportar
+    if incremental and not args.exportar:
+        print("⏭️ Ajuste incremental: artefacto TFLite sin exportar (usar --exportar)")
+    else:
+        with metricas.tramo("exportar_tflite"):
+            exportar_tflite(modelo_lstm, modelo_trans, seq_length, modos=args.cuantizaciones)